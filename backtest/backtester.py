@@ -52,14 +52,16 @@ class Backtester:
         if 'signal' not in data_with_signals.columns:
             raise ValueError("数据中缺少信号列 (signal)")
         
-        # 创建数据副本
-        df = data_with_signals.copy()
+        # 预先取出价格和信号数组，逐日循环只做标量运算
+        dates = data_with_signals.index
+        signals = data_with_signals['signal'].to_numpy()
+        closes = data_with_signals['Close'].to_numpy(dtype=np.float64)
+        n = len(data_with_signals)
         
-        # 初始化资产组合状态
-        df['holdings'] = 0  # 持仓数量
-        df['cash'] = float(self.initial_capital)  # 现金
-        df['portfolio_value'] = float(self.initial_capital)  # 总资产
-        df['returns'] = 0.0  # 收益率
+        # 预分配资产组合状态数组，循环结束后一次性写入DataFrame
+        holdings = np.zeros(n, dtype=np.int64)  # 持仓数量
+        cash = np.empty(n)  # 现金
+        portfolio_value = np.empty(n)  # 总资产
         
         # 交易记录列表
         trades = []
@@ -69,11 +71,10 @@ class Backtester:
         current_cash = float(self.initial_capital)
         
         # 逐日模拟交易
-        for i in range(len(df)):
-            date = df.index[i]
-            row = df.iloc[i]
-            signal = row['signal']
-            price = row['Close']
+        for i in range(n):
+            date = dates[i]
+            signal = signals[i]
+            price = closes[i]
             
             # 考虑滑点的实际成交价
             buy_price = price * (1 + self.slippage)
@@ -131,17 +132,19 @@ class Backtester:
                 })
             
             # 更新当日资产组合状态
-            df.loc[date, 'holdings'] = current_holdings
-            df.loc[date, 'cash'] = current_cash
-            df.loc[date, 'portfolio_value'] = current_cash + current_holdings * price
+            holdings[i] = current_holdings
+            cash[i] = current_cash
+            portfolio_value[i] = current_cash + current_holdings * price
         
-        # 计算每日收益率
-        df['returns'] = df['portfolio_value'].pct_change()
+        # 计算每日收益率 (基于强制平仓前的资产)
+        returns = np.empty(n)
+        returns[:1] = np.nan
+        returns[1:] = portfolio_value[1:] / portfolio_value[:-1] - 1
         
         # 如果最后还有持仓，强制平仓
         if current_holdings > 0:
-            last_date = df.index[-1]
-            last_price = df.iloc[-1]['Close']
+            last_date = dates[-1]
+            last_price = closes[-1]
             shares = current_holdings
             revenue = shares * last_price
             commission = revenue * self.commission_rate
@@ -161,9 +164,16 @@ class Backtester:
             })
             
             # 更新最后一天的资产
-            df.loc[last_date, 'holdings'] = 0
-            df.loc[last_date, 'cash'] = current_cash + total_revenue
-            df.loc[last_date, 'portfolio_value'] = current_cash + total_revenue
+            holdings[-1] = 0
+            cash[-1] = current_cash + total_revenue
+            portfolio_value[-1] = current_cash + total_revenue
+        
+        df = data_with_signals.assign(
+            holdings=holdings,
+            cash=cash,
+            portfolio_value=portfolio_value,
+            returns=returns,
+        )
         
         # 转换交易记录为DataFrame
         trades_df = pd.DataFrame(trades) if trades else pd.DataFrame()
@@ -4,8 +4,10 @@
 """
 
 import pandas as pd
+import numpy as np
 from datetime import datetime
 from strategies.strategy import StrategyFactory
+from strategies.indicators import IndicatorCache
 from backtest.backtester import Backtester
 from backtest.analyzer import Analyzer
 
@@ -140,6 +142,14 @@ class StrategyComparator:
         data = self.data_handler.get_data(tickers)
         print(f"✓ 数据获取成功，共 {len(data)} 条\n")
         
+        # 价格列统一转换为float64一次，各策略直接在同一份数据上取数组
+        # (策略不会修改输入数据，无需逐个复制)
+        price_columns = [col for col in ('Open', 'High', 'Low', 'Close', 'Volume') if col in data.columns]
+        data = data.astype({col: np.float64 for col in price_columns})
+        
+        # 所有策略共享同一个指标缓存，相同窗口的均线只计算一次
+        indicator_cache = IndicatorCache()
+        
         results = []
         total_strategies = len(self.available_strategies)
         
@@ -157,7 +167,7 @@ class StrategyComparator:
                 strategy = StrategyFactory.create_strategy(strategy_config)
                 
                 # 生成信号
-                data_with_signals = strategy.generate_signals(data.copy())
+                data_with_signals = strategy.generate_signals(data, indicator_cache)
                 
                 # 执行回测
                 backtester = Backtester(self.backtest_config)
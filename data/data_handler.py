@@ -26,6 +26,13 @@ class DataHandler:
         self.use_cache = config['use_cache']
         self.cache_dir = config['cache_dir']
         
+        # 日期在每只股票的请求中都会用到，初始化时解析一次
+        self.start_date = config['start_date']
+        self.end_date = config['end_date']
+        # akshare / tushare / 缓存文件名使用的紧凑格式 (YYYYMMDD)
+        self.start_compact = self.start_date.replace('-', '')
+        self.end_compact = self.end_date.replace('-', '')
+        
         # 确保缓存目录存在
         if self.use_cache:
             os.makedirs(self.cache_dir, exist_ok=True)
@@ -103,8 +110,8 @@ class DataHandler:
                 df = ak.stock_zh_a_hist(
                     symbol=symbol,
                     period="daily",
-                    start_date=self.config['start_date'].replace('-', ''),
-                    end_date=self.config['end_date'].replace('-', ''),
+                    start_date=self.start_compact,
+                    end_date=self.end_compact,
                     adjust="qfq"  # 前复权
                 )
                 
@@ -188,8 +195,8 @@ class DataHandler:
                 # 使用 Ticker 对象获取数据
                 stock = yf.Ticker(ticker_clean)
                 df = stock.history(
-                    start=self.config['start_date'],
-                    end=self.config['end_date']
+                    start=self.start_date,
+                    end=self.end_date
                 )
                 
                 if df.empty:
@@ -254,9 +261,7 @@ class DataHandler:
     def _get_cache_path(self, tickers):
         """生成缓存文件路径"""
         ticker_str = '_'.join(sorted(tickers))
-        start = self.config['start_date'].replace('-', '')
-        end = self.config['end_date'].replace('-', '')
-        filename = f"{ticker_str}_{start}_{end}_{self.data_source}.pkl"
+        filename = f"{ticker_str}_{self.start_compact}_{self.end_compact}_{self.data_source}.pkl"
         return os.path.join(self.cache_dir, filename)
     
     def _load_from_cache(self, tickers):
@@ -314,8 +319,8 @@ class DataHandler:
                 # 获取日线行情
                 df = pro.daily(
                     ts_code=ticker_clean,
-                    start_date=self.config['start_date'].replace('-', ''),
-                    end_date=self.config['end_date'].replace('-', ''),
+                    start_date=self.start_compact,
+                    end_date=self.end_compact,
                     fields='ts_code,trade_date,open,high,low,close,vol'
                 )
                 
@@ -401,8 +406,8 @@ class DataHandler:
                     # 获取历史K线数据
                     ret, data = quote_ctx.get_history_kline(
                         code=futu_code,
-                        start=self.config['start_date'],
-                        end=self.config['end_date'],
+                        start=self.start_date,
+                        end=self.end_date,
                         ktype=KLType.K_DAY,
                         autype=AuType.QFQ  # 前复权
                     )
@@ -12,10 +12,9 @@ from PyQt5.QtWidgets import (
     QTextEdit, QTabWidget, QGroupBox, QGridLayout, QMessageBox,
     QProgressBar, QFileDialog, QSplitter, QAction, QMenu, QCompleter
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSettings, QStringListModel
+from PyQt5.QtCore import Qt, QThread, QTimer, pyqtSignal, QSettings, QStringListModel
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 import pyqtgraph as pg
-from pyqtgraph.exporters import ImageExporter
 import numpy as np
 
 # 导入回测系统模块
@@ -23,12 +22,11 @@ from config.config import (
     DATA_CONFIG, STRATEGY_CONFIG, BACKTEST_CONFIG, ANALYSIS_CONFIG,
     config_manager
 )
-from data.data_handler import DataHandler
-from strategies.strategy import StrategyFactory
-from backtest.backtester import Backtester
-from backtest.analyzer import Analyzer
 from utils.stock_list import StockDatabase
 
+# 数据、策略、回测模块（依赖pandas/matplotlib，导入较慢）在工作线程中按需导入，
+# 窗口显示后再预加载，不阻塞界面启动
+
 
 # 配置PyQtGraph
 pg.setConfigOption('background', 'w')  # 白色背景
@@ -50,6 +48,7 @@ class CompareThread(QThread):
     def run(self):
         """执行策略对比"""
         try:
+            from data.data_handler import DataHandler
             from backtest.strategy_comparator import StrategyComparator
             
             self.progress_update.emit("🔄 初始化策略对比器...")
@@ -91,6 +90,11 @@ class BacktestThread(QThread):
     def run(self):
         """执行回测"""
         try:
+            from data.data_handler import DataHandler
+            from strategies.strategy import StrategyFactory
+            from backtest.backtester import Backtester
+            from backtest.analyzer import Analyzer
+            
             # 步骤 1: 初始化模块
             self.progress_update.emit("📦 [1/6] 初始化模块...")
             
@@ -155,6 +159,15 @@ class MainWindow(QMainWindow):
         self.load_default_config()
         
         self.init_ui()
+        
+        # 窗口显示后再加载耗时模块
+        QTimer.singleShot(0, self._post_show_init)
+    
+    def _post_show_init(self):
+        """窗口显示后预加载数据、策略和回测模块，缩短首次回测的等待"""
+        import data.data_handler
+        import strategies.strategy
+        import backtest.strategy_comparator
     
     def get_popular_stocks(self):
         """获取股票代码列表，用于自动补全"""
@@ -1136,6 +1149,7 @@ class MainWindow(QMainWindow):
         
         if filename:
             # 使用PyQtGraph的导出功能
+            from pyqtgraph.exporters import ImageExporter
             exporter = ImageExporter(chart_widget.scene())
             exporter.parameters()['width'] = 1920  # 设置宽度
             exporter.export(filename)
@@ -1311,6 +1325,8 @@ class MainWindow(QMainWindow):
         
         if reply == QMessageBox.Yes:
             import shutil
+            from strategies.base_strategy import clear_signal_cache
+            clear_signal_cache()
             cache_dir = './data/cache'
             if os.path.exists(cache_dir):
                 shutil.rmtree(cache_dir)
@@ -4,18 +4,12 @@
 """
 
 import sys
-import os
 from datetime import datetime
 
+from utils.console import ensure_utf8
+
 # 设置Windows控制台编码为UTF-8（解决中文乱码问题）
-if sys.platform == 'win32':
-    try:
-        os.system('chcp 65001 >nul 2>&1')
-        if hasattr(sys.stdout, 'reconfigure'):
-            sys.stdout.reconfigure(encoding='utf-8')
-            sys.stderr.reconfigure(encoding='utf-8')
-    except Exception as e:
-        print(f"Warning: Failed to set UTF-8 encoding: {e}")
+ensure_utf8()
 
 from config.config import (
     DATA_CONFIG,
@@ -53,7 +47,8 @@ def run():
         print("-" * 70)
         
         data_handler = DataHandler(DATA_CONFIG)
-        strategy = StrategyFactory.create_strategy(STRATEGY_CONFIG)
+        # 命令行版本默认输出策略初始化参数和信号统计 (配置文件中设置 verbose 时以配置为准)
+        strategy = StrategyFactory.create_strategy({'verbose': True, **STRATEGY_CONFIG})
         backtester = Backtester(BACKTEST_CONFIG)
         analyzer = Analyzer(ANALYSIS_CONFIG)
         
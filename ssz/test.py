@@ -1,8 +1,11 @@
+import matplotlib
+matplotlib.use('Agg')  # 无界面后端，只保存图片
+
 import yfinance as yf
 import matplotlib.pyplot as plt
 
-# Download stock data
-data = yf.download(['MSFT', 'AAPL', 'GOOG'], period='1mo')
+# Download stock data (tickers fetched in parallel)
+data = yf.download(['MSFT', 'AAPL', 'GOOG'], period='1mo', threads=True, progress=False)
 
 # Plot closing prices
 plt.figure(figsize=(12, 6))
@@ -10,10 +13,9 @@ data['Close'].plot()
 plt.title('Stock Prices - 1 Month')
 plt.xlabel('Date')
 plt.ylabel('Price (USD)')
-plt.legend(['MSFT', 'AAPL', 'GOOG'])
+plt.legend()
 plt.grid(True)
 plt.tight_layout()
 plt.savefig('ssz/stock_chart.png')
-plt.show()
 
 print("Chart saved to ssz/stock_chart.png")
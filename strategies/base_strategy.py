@@ -3,8 +3,54 @@
 定义所有策略的通用接口和工厂类
 """
 
+import threading
+import numpy as np
 import pandas as pd
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from functools import cache, wraps
+
+from .indicators import cached_sma
+
+
+# 信号结果缓存 (LRU)：相同策略、相同配置、相同数据时直接复用上次的结果
+_SIGNAL_CACHE_SIZE = 32
+_signal_cache = OrderedDict()
+_signal_cache_lock = threading.Lock()
+
+
+def cached_signals(generate_signals):
+    """
+    generate_signals 的缓存装饰器
+    
+    缓存键由策略类名、策略配置和输入数据指纹组成，命中时返回缓存结果的副本
+    """
+    @wraps(generate_signals)
+    def wrapper(self, data, cache=None):
+        key = self._cache_key(data)
+        with _signal_cache_lock:
+            cached = _signal_cache.get(key)
+            if cached is not None:
+                _signal_cache.move_to_end(key)
+        if cached is not None:
+            return cached.copy()
+        
+        result = generate_signals(self, data, cache)
+        
+        with _signal_cache_lock:
+            _signal_cache[key] = result.copy()
+            while len(_signal_cache) > _SIGNAL_CACHE_SIZE:
+                _signal_cache.popitem(last=False)
+        return result
+    
+    return wrapper
+
+
+def clear_signal_cache():
+    """清空信号结果缓存和均线缓存 (数据重新加载或清理缓存时调用)"""
+    with _signal_cache_lock:
+        _signal_cache.clear()
+    cached_sma.cache_clear()
 
 
 class BaseStrategy(ABC):
@@ -16,17 +62,22 @@ class BaseStrategy(ABC):
         
         Args:
             config: 策略配置字典 (STRATEGY_CONFIG)
+                - verbose: 是否输出初始化参数、信号统计和数据量不足等提示 (print 与 logging 均受控), 默认 False
+                - use_float32: 指标计算是否使用 float32 价格数组, 默认 False
         """
         self.config = config
         self.strategy_name = config.get('strategy_name', 'BaseStrategy')
+        self.verbose = config.get('verbose', False)
+        self.use_float32 = config.get('use_float32', False)
     
     @abstractmethod
-    def generate_signals(self, data):
+    def generate_signals(self, data, cache=None):
         """
         生成交易信号的抽象方法 (子类必须实现)
         
         Args:
             data: pd.DataFrame, 包含OHLCV数据
+            cache: IndicatorCache, 可选, 多个策略共用同一份数据时共享的指标缓存
             
         Returns:
             pd.DataFrame: 添加了信号列的数据
@@ -34,6 +85,53 @@ class BaseStrategy(ABC):
         """
         pass
     
+    @classmethod
+    def generate_signals_batch(cls, data, config, ticker_col='symbol'):
+        """
+        为包含多只股票的长表数据批量生成信号
+        
+        默认实现按股票分组后逐组调用 generate_signals；
+        子类可以覆盖为基于 groupby().transform() 的整表向量化实现
+        
+        Args:
+            data: pd.DataFrame, 多只股票的OHLCV数据, 以 ticker_col 列区分股票
+            config: 策略配置字典
+            ticker_col: 股票代码列名
+            
+        Returns:
+            pd.DataFrame: 各股票添加了信号列后的数据 (保持原有分组顺序)
+        """
+        strategy = cls(config)
+        results = [
+            strategy.generate_signals(group)
+            for _, group in data.groupby(ticker_col, sort=False, observed=True)
+        ]
+        results = [df for df in results if not df.empty]
+        if not results:
+            return pd.DataFrame()
+        return pd.concat(results)
+    
+    def _cache_key(self, data):
+        """生成信号缓存键: (策略类名, 配置, 数据指纹)"""
+        config_key = tuple(sorted((k, repr(v)) for k, v in self.config.items()))
+        
+        # 数据指纹: 列名和整表内容 (含索引及所有列) 的逐行哈希，
+        # 任何一个日期或透传列 (如 Ticker) 不同都会得到不同的键
+        row_hashes = pd.util.hash_pandas_object(data, index=True).to_numpy()
+        data_key = (len(data), tuple(data.columns), hash(row_hashes.tobytes()))
+        
+        return (type(self).__name__, config_key, data_key)
+    
+    def _price_array(self, data, column='Close'):
+        """
+        取出价格列的连续数组用于指标计算
+        
+        use_float32 开启时返回 float32 数组，内存带宽减半；
+        回测层的资金计算始终使用 float64，不受此设置影响
+        """
+        dtype = np.float32 if self.use_float32 else np.float64
+        return np.ascontiguousarray(data[column].to_numpy(dtype=dtype))
+    
     def _validate_data(self, data):
         """验证输入数据的完整性"""
         required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
@@ -48,6 +146,43 @@ class BaseStrategy(ABC):
         return True
 
 
+@cache
+def _strategy_registry():
+    """
+    策略名称到策略类的映射 (首次调用时构建，之后复用)
+    
+    各策略模块都继承自本模块的 BaseStrategy，因此延迟到首次使用时再导入，
+    避免循环导入
+    """
+    from .short_term_strategies import (
+        DualMovingAverageStrategy, MACDStrategy, BollingerBandsStrategy,
+        RSIStrategy, KDJStrategy
+    )
+    from .long_term_strategies import (
+        TripleMovingAverageStrategy, MomentumStrategy,
+        TurtleTradingStrategy, MeanReversionStrategy
+    )
+    from .combo_strategies import ComboStrategy
+    
+    return {
+        # 短期策略
+        'DualMovingAverage': DualMovingAverageStrategy,
+        'MACD': MACDStrategy,
+        'BollingerBands': BollingerBandsStrategy,
+        'RSI': RSIStrategy,
+        'KDJ': KDJStrategy,
+        
+        # 长期策略
+        'TripleMovingAverage': TripleMovingAverageStrategy,
+        'Momentum': MomentumStrategy,
+        'TurtleTrading': TurtleTradingStrategy,
+        'MeanReversion': MeanReversionStrategy,
+        
+        # 组合策略
+        'Combo': ComboStrategy,
+    }
+
+
 class StrategyFactory:
     """策略工厂 - 用于创建不同的策略实例"""
     
@@ -62,35 +197,8 @@ class StrategyFactory:
         Returns:
             BaseStrategy: 策略实例
         """
-        from .short_term_strategies import (
-            DualMovingAverageStrategy, MACDStrategy, BollingerBandsStrategy,
-            RSIStrategy, KDJStrategy
-        )
-        from .long_term_strategies import (
-            TripleMovingAverageStrategy, MomentumStrategy,
-            TurtleTradingStrategy, MeanReversionStrategy
-        )
-        from .combo_strategies import ComboStrategy
-        
         strategy_name = config.get('strategy_name', 'DualMovingAverage')
-        
-        strategies = {
-            # 短期策略
-            'DualMovingAverage': DualMovingAverageStrategy,
-            'MACD': MACDStrategy,
-            'BollingerBands': BollingerBandsStrategy,
-            'RSI': RSIStrategy,
-            'KDJ': KDJStrategy,
-            
-            # 长期策略
-            'TripleMovingAverage': TripleMovingAverageStrategy,
-            'Momentum': MomentumStrategy,
-            'TurtleTrading': TurtleTradingStrategy,
-            'MeanReversion': MeanReversionStrategy,
-            
-            # 组合策略
-            'Combo': ComboStrategy,
-        }
+        strategies = _strategy_registry()
         
         strategy_class = strategies.get(strategy_name)
         
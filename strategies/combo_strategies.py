@@ -5,7 +5,8 @@
 
 import pandas as pd
 import numpy as np
-from .base_strategy import BaseStrategy
+from .base_strategy import BaseStrategy, cached_signals
+from .indicators import macd_kernel
 
 
 class ComboStrategy(BaseStrategy):
@@ -27,11 +28,11 @@ class ComboStrategy(BaseStrategy):
         self.rsi_oversold = config.get('rsi_oversold', 30)
         self.rsi_overbought = config.get('rsi_overbought', 70)
         
-        print(f"[策略层] 初始化 {self.strategy_name} 组合策略")
-        print(f"  MACD: {self.macd_fast}/{self.macd_slow}/{self.macd_signal}")
-        print(f"  RSI: {self.rsi_period}日, 超卖{self.rsi_oversold}/超买{self.rsi_overbought}")
+        if self.verbose:
+            print(f"[策略层] 初始化 {self.strategy_name} 组合策略 | MACD: {self.macd_fast}/{self.macd_slow}/{self.macd_signal}, RSI: {self.rsi_period}日, 超卖{self.rsi_oversold}/超买{self.rsi_overbought}")
     
-    def generate_signals(self, data):
+    @cached_signals
+    def generate_signals(self, data, cache=None):
         """
         生成组合策略信号
         
@@ -39,48 +40,54 @@ class ComboStrategy(BaseStrategy):
         - 买入: MACD金叉 且 RSI<50 (趋势向上且未超买)
         - 卖出: MACD死叉 或 RSI>70 (趋势向下或超买)
         """
-        print(f"[策略层] 开始生成组合策略信号...")
-        
         self._validate_data(data)
-        df = data.copy()
         
-        # 计算MACD
-        exp1 = df['Close'].ewm(span=self.macd_fast, adjust=False).mean()
-        exp2 = df['Close'].ewm(span=self.macd_slow, adjust=False).mean()
-        df['MACD'] = exp1 - exp2
-        df['MACD_Signal'] = df['MACD'].ewm(span=self.macd_signal, adjust=False).mean()
+        # 数据量不足时直接返回，不做任何计算
+        if len(data) < self.rsi_period:
+            if self.verbose:
+                print(f"[策略层] 数据量不足: {len(data)} < {self.rsi_period}")
+            return pd.DataFrame()
         
-        # 计算RSI
-        delta = df['Close'].diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean()
-        rs = gain / loss
-        df['RSI'] = 100 - (100 / (1 + rs))
+        close = data['Close']
         
-        # 生成信号
-        df['signal'] = 0
+        # 计算MACD (快线、慢线、信号线及交叉单次遍历完成)
+        macd, macd_signal, _, macd_cross_up, macd_cross_down = macd_kernel(
+            self._price_array(data, 'Close'),
+            self.macd_fast, self.macd_slow, self.macd_signal
+        )
         
-        # MACD状态
-        df['MACD_Bullish'] = df['MACD'] > df['MACD_Signal']
-        df['MACD_Cross_Up'] = (df['MACD'] > df['MACD_Signal']) & (df['MACD'].shift(1) <= df['MACD_Signal'].shift(1))
-        df['MACD_Cross_Down'] = (df['MACD'] < df['MACD_Signal']) & (df['MACD'].shift(1) >= df['MACD_Signal'].shift(1))
+        # 计算RSI
+        delta = close.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(window=self.rsi_period).mean().to_numpy()
+        loss = (-delta.where(delta < 0, 0)).rolling(window=self.rsi_period).mean().to_numpy()
+        # RSI = 100 - 100 / (1 + gain/loss)，原地运算避免中间数组
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rsi = np.divide(gain, loss)
+        rsi += 1
+        np.divide(100, rsi, out=rsi)
+        np.subtract(100, rsi, out=rsi)
         
         # 买入: MACD金叉 且 RSI不在超买区
-        buy_condition = df['MACD_Cross_Up'] & (df['RSI'] < 60)
-        df.loc[buy_condition, 'signal'] = 1
+        buy_condition = macd_cross_up & (rsi < 60)
         
         # 卖出: MACD死叉 或 RSI超买
-        sell_condition = df['MACD_Cross_Down'] | (df['RSI'] > self.rsi_overbought)
-        df.loc[sell_condition, 'signal'] = -1
+        sell_condition = macd_cross_down | (rsi > self.rsi_overbought)
+        
+        signal = np.where(sell_condition, -1, np.where(buy_condition, 1, 0)).astype(np.int8)
         
-        df = df.drop(['MACD_Bullish', 'MACD_Cross_Up', 'MACD_Cross_Down'], axis=1)
-        df = df.dropna()
+        # 去掉RSI预热期 (MACD由递推计算，无预热NaN)
+        valid_start = self.rsi_period - 1
         
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
+        df = data.assign(
+            MACD=macd,
+            MACD_Signal=macd_signal,
+            RSI=rsi,
+            signal=signal,
+        ).iloc[valid_start:]
         
-        print(f"[策略层] 组合策略信号生成完成")
-        print(f"  买入信号数: {buy_signals}")
-        print(f"  卖出信号数: {sell_signals}")
+        if self.verbose:
+            buy_signals = (df['signal'] == 1).sum()
+            sell_signals = (df['signal'] == -1).sum()
+            print(f"[策略层] 组合策略信号生成完成 | 买入信号数: {buy_signals}, 卖出信号数: {sell_signals}")
         
         return df
@@ -0,0 +1,301 @@
+"""
+指标计算模块 (Indicators)
+供各策略共用的数值计算内核，直接在NumPy数组上运算
+
+numba 为可选依赖: 已安装时内核被JIT编译为本地代码，
+未安装时退化为纯Python实现，结果一致但速度较慢
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import bottleneck as bn
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """numba 不可用时的占位装饰器，原样返回函数"""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@lru_cache(maxsize=128)
+def cached_sma(close_bytes, window, dtype='<f8'):
+    """
+    带缓存的简单移动平均
+
+    以收盘价的原始字节为键，参数寻优等场景中同一份数据、同一窗口的均线只计算一次
+
+    Args:
+        close_bytes: bytes, 收盘价数组的 tobytes() 结果
+        window: 均线窗口
+        dtype: 收盘价数组的 dtype 字符串, 默认 float64
+
+    Returns:
+        np.ndarray: 只读的均线数组 (与输入同精度)，窗口期内为 NaN
+    """
+    close = np.frombuffer(close_bytes, dtype=dtype)
+    if window > len(close):
+        sma = np.full(len(close), np.nan, dtype=close.dtype)
+    else:
+        sma = bn.move_mean(close, window, min_count=window)
+    # 结果被多次复用，禁止调用方原地修改
+    sma.flags.writeable = False
+    return sma
+
+
+class IndicatorCache:
+    """
+    单次运行内共享的指标缓存
+
+    多个策略在同一份数据上生成信号时传入同一个实例，已计算的均线直接复用。
+    输入数组按缓冲区地址、长度、步长和 dtype 区分，
+    同一列多次 to_numpy() 得到的视图会命中同一条目
+    """
+
+    def __init__(self):
+        self._store = {}
+
+    @staticmethod
+    def _key(values, kind, param):
+        return (values.__array_interface__['data'][0], len(values), values.strides,
+                values.dtype.str, kind, param)
+
+    def sma(self, close, window):
+        """
+        简单移动平均 (窗口期内为 NaN)
+
+        Args:
+            close: np.ndarray, float64 或 float32 数组
+            window: 均线窗口
+
+        Returns:
+            np.ndarray: 只读的均线数组
+        """
+        key = self._key(close, 'sma', window)
+        entry = self._store.get(key)
+        if entry is None:
+            # 同时持有输入数组的引用，保证缓存存续期间缓冲区地址不会被复用
+            entry = (close, cached_sma(np.ascontiguousarray(close).tobytes(), window, close.dtype.str))
+            self._store[key] = entry
+        return entry[1]
+
+
+@njit(cache=True)
+def ewma(x, alpha):
+    """
+    指数加权移动平均 (单次遍历)
+
+    对无缺失值的序列与 pandas 的 ewm(alpha=alpha, adjust=False).mean() 逐位一致。
+    以首个非NaN值为初始值，之前输出NaN；遇到NaN时沿用上一输出，
+    并按间隔天数衰减旧值权重
+
+    Args:
+        x: np.ndarray, 输入序列
+        alpha: 平滑系数, 对应 span 时为 2 / (span + 1)
+
+    Returns:
+        np.ndarray: float64 数组
+    """
+    n = len(x)
+    out = np.empty(n)
+    avg = np.nan
+    old_wt = 1.0
+    for i in range(n):
+        cur = x[i]
+        observed = cur == cur
+        if avg == avg:
+            old_wt *= 1.0 - alpha
+            if observed:
+                # 常数序列时跳过更新，避免浮点误差
+                if avg != cur:
+                    avg = (old_wt * avg + alpha * cur) / (old_wt + alpha)
+                old_wt = 1.0
+        elif observed:
+            avg = cur
+        out[i] = avg
+    return out
+
+
+@njit(cache=True)
+def macd_kernel(close, fast, slow, signal):
+    """
+    单次遍历计算MACD全部输出
+
+    快线、慢线、信号线均等价于 pandas 的 ewm(span=..., adjust=False).mean()，
+    以 close[0] 为初始值；金叉/死叉与前一日比较，首日恒为 False
+
+    Args:
+        close: np.ndarray, 收盘价 (float64)
+        fast: 快线周期
+        slow: 慢线周期
+        signal: 信号线周期
+
+    Returns:
+        tuple: (macd, signal_line, hist, cross_up, cross_down)
+            前三个为 float64 数组，后两个为 bool 数组
+    """
+    n = len(close)
+    macd = np.empty(n)
+    signal_line = np.empty(n)
+    hist = np.empty(n)
+    cross_up = np.zeros(n, dtype=np.bool_)
+    cross_down = np.zeros(n, dtype=np.bool_)
+    if n == 0:
+        return macd, signal_line, hist, cross_up, cross_down
+
+    a_fast = 2.0 / (fast + 1)
+    a_slow = 2.0 / (slow + 1)
+    a_signal = 2.0 / (signal + 1)
+
+    ema_fast = close[0]
+    ema_slow = close[0]
+    macd[0] = 0.0
+    signal_line[0] = 0.0
+    hist[0] = 0.0
+    for i in range(1, n):
+        ema_fast = a_fast * close[i] + (1.0 - a_fast) * ema_fast
+        ema_slow = a_slow * close[i] + (1.0 - a_slow) * ema_slow
+        macd[i] = ema_fast - ema_slow
+        signal_line[i] = a_signal * macd[i] + (1.0 - a_signal) * signal_line[i - 1]
+        hist[i] = macd[i] - signal_line[i]
+
+        # 柱状图即 macd - signal_line，按其符号变化判断交叉
+        cross_up[i] = hist[i] > 0 and hist[i - 1] <= 0
+        cross_down[i] = hist[i] < 0 and hist[i - 1] >= 0
+
+    return macd, signal_line, hist, cross_up, cross_down
+
+
+def crossings(a, b):
+    """
+    交叉检测: 基于差值 a - b 的符号变化
+
+    上穿: 当日差值 > 0 且前一日差值 <= 0
+    下穿: 当日差值 < 0 且前一日差值 >= 0
+
+    Args:
+        a, b: np.ndarray, 等长数组
+
+    Returns:
+        tuple: (cross_up, cross_down) 两个 bool 数组，首日恒为 False
+    """
+    diff = a - b
+    up = np.zeros(len(diff), dtype=bool)
+    down = np.zeros(len(diff), dtype=bool)
+    up[1:] = (diff[1:] > 0) & (diff[:-1] <= 0)
+    down[1:] = (diff[1:] < 0) & (diff[:-1] >= 0)
+    return up, down
+
+
+def keep_signal_changes(signal):
+    """
+    只保留信号发生变化的位置，连续重复的信号置0
+
+    Args:
+        signal: np.ndarray, 原始信号数组
+
+    Returns:
+        np.ndarray: 去重后的信号 (与输入同dtype的新数组)
+    """
+    changed = np.empty(len(signal), dtype=bool)
+    changed[:1] = True
+    np.not_equal(signal[1:], signal[:-1], out=changed[1:])
+    return np.where(changed, signal, 0).astype(signal.dtype, copy=False)
+
+
+@njit(cache=True)
+def long_only_signals(entry, exit):
+    """
+    单向持仓状态机: 空仓时遇到入场条件买入，持仓时遇到离场条件卖出
+
+    Args:
+        entry: np.ndarray[bool], 入场条件
+        exit: np.ndarray[bool], 离场条件
+
+    Returns:
+        np.ndarray: int8 信号数组 (1=买入, -1=卖出, 0=持有)
+    """
+    n = len(entry)
+    signal = np.zeros(n, dtype=np.int8)
+    holding = False
+    for i in range(n):
+        if not holding:
+            if entry[i]:
+                signal[i] = 1
+                holding = True
+        elif exit[i]:
+            signal[i] = -1
+            holding = False
+    return signal
+
+
+# KDJ卖出原因代码
+KDJ_EXIT_NONE = 0
+KDJ_EXIT_STOP_LOSS = 1
+KDJ_EXIT_TAKE_PROFIT = 2
+KDJ_EXIT_TRAILING_STOP = 3
+KDJ_EXIT_OVERBOUGHT = 4
+
+
+@njit(cache=True)
+def kdj_signals(close, k, d, oversold, overbought,
+                stop_loss, take_profit, trailing_stop, trailing_trigger):
+    """
+    KDJ交易信号状态机 (含止损、止盈和移动止损)
+
+    Args:
+        close, k, d: np.ndarray, 收盘价与K、D值 (float64)
+        oversold, overbought: 超卖/超买阈值
+        stop_loss, take_profit: 固定止损/止盈比例
+        trailing_stop, trailing_trigger: 移动止损回撤比例及触发盈利比例
+
+    Returns:
+        tuple: (signal, exit_reason) 两个 int8 数组，
+            exit_reason 在卖出位置记录 KDJ_EXIT_* 代码
+    """
+    n = len(close)
+    signal = np.zeros(n, dtype=np.int8)
+    exit_reason = np.zeros(n, dtype=np.int8)
+
+    holding = False
+    entry_price = 0.0
+    highest_price = 0.0
+
+    for i in range(n):
+        price = close[i]
+
+        if not holding:
+            # 超卖区域 + K上穿D => 买入
+            if k[i] < oversold and k[i] > d[i]:
+                signal[i] = 1
+                holding = True
+                entry_price = price
+                highest_price = price
+            continue
+
+        # 更新最高价
+        if price > highest_price:
+            highest_price = price
+
+        profit_rate = (price - entry_price) / entry_price
+        drawdown = (price - highest_price) / highest_price
+
+        reason = KDJ_EXIT_NONE
+        if profit_rate <= -stop_loss:
+            reason = KDJ_EXIT_STOP_LOSS
+        elif profit_rate >= take_profit:
+            reason = KDJ_EXIT_TAKE_PROFIT
+        elif profit_rate >= trailing_trigger and drawdown <= -trailing_stop:
+            reason = KDJ_EXIT_TRAILING_STOP
+        elif k[i] > overbought and k[i] < d[i]:
+            reason = KDJ_EXIT_OVERBOUGHT
+
+        if reason != KDJ_EXIT_NONE:
+            signal[i] = -1
+            exit_reason[i] = reason
+            holding = False
+
+    return signal, exit_reason
@@ -5,7 +5,9 @@
 
 import pandas as pd
 import numpy as np
-from .base_strategy import BaseStrategy
+import bottleneck as bn
+from .base_strategy import BaseStrategy, cached_signals
+from .indicators import IndicatorCache, keep_signal_changes
 
 
 class TripleMovingAverageStrategy(BaseStrategy):
@@ -21,12 +23,11 @@ class TripleMovingAverageStrategy(BaseStrategy):
         self.medium_window = config.get('triple_ma_medium', 20)
         self.long_window = config.get('triple_ma_long', 60)
         
-        print(f"[策略层] 初始化 {self.strategy_name} 策略")
-        print(f"  短期均线: {self.short_window} 日")
-        print(f"  中期均线: {self.medium_window} 日")
-        print(f"  长期均线: {self.long_window} 日")
+        if self.verbose:
+            print(f"[策略层] 初始化 {self.strategy_name} 策略 | 短期均线: {self.short_window} 日, 中期均线: {self.medium_window} 日, 长期均线: {self.long_window} 日")
     
-    def generate_signals(self, data):
+    @cached_signals
+    def generate_signals(self, data, cache=None):
         """
         生成三均线交易信号
         
@@ -34,38 +35,50 @@ class TripleMovingAverageStrategy(BaseStrategy):
         - 买入: 短期>中期>长期 (多头排列)
         - 卖出: 短期<中期<长期 (空头排列)
         """
-        print(f"[策略层] 开始生成三均线信号...")
-        
         self._validate_data(data)
-        df = data.copy()
         
-        # 计算三条均线
-        df['MA_Short'] = df['Close'].rolling(window=self.short_window).mean()
-        df['MA_Medium'] = df['Close'].rolling(window=self.medium_window).mean()
-        df['MA_Long'] = df['Close'].rolling(window=self.long_window).mean()
+        # 数据量不足时直接返回，不做任何计算
+        required = max(self.short_window, self.medium_window, self.long_window)
+        if len(data) < required:
+            if self.verbose:
+                print(f"[策略层] 数据量不足: {len(data)} < {required}")
+            return pd.DataFrame()
+        
+        if cache is None:
+            cache = IndicatorCache()
+        close = self._price_array(data, 'Close')
         
-        # 生成信号
-        df['signal'] = 0
-        df['position'] = 0
+        # 计算三条均线
+        ma_short = cache.sma(close, self.short_window)
+        ma_medium = cache.sma(close, self.medium_window)
+        ma_long = cache.sma(close, self.long_window)
         
         # 多头排列: 短>中>长
-        bull_condition = (df['MA_Short'] > df['MA_Medium']) & (df['MA_Medium'] > df['MA_Long'])
-        df.loc[bull_condition, 'position'] = 1
+        bull_condition = (ma_short > ma_medium) & (ma_medium > ma_long)
         
         # 空头排列: 短<中<长
-        bear_condition = (df['MA_Short'] < df['MA_Medium']) & (df['MA_Medium'] < df['MA_Long'])
-        df.loc[bear_condition, 'position'] = -1
+        bear_condition = (ma_short < ma_medium) & (ma_medium < ma_long)
+        
+        position = np.where(bear_condition, -1, np.where(bull_condition, 1, 0)).astype(np.int8)
+        
+        # 信号 = 持仓状态的变化
+        signal = np.zeros(len(data), dtype=np.int8)
+        signal[1:] = np.diff(position)
         
-        df['signal'] = df['position'].diff()
-        df = df.drop('position', axis=1)
-        df = df.dropna()
+        # 去掉均线预热期 (最长窗口之前均线为NaN)
+        valid_start = max(self.short_window, self.medium_window, self.long_window) - 1
         
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
+        df = data.assign(
+            MA_Short=ma_short,
+            MA_Medium=ma_medium,
+            MA_Long=ma_long,
+            signal=signal,
+        ).iloc[valid_start:]
         
-        print(f"[策略层] 三均线信号生成完成")
-        print(f"  买入信号数: {buy_signals}")
-        print(f"  卖出信号数: {sell_signals}")
+        if self.verbose:
+            buy_signals = (df['signal'] == 1).sum()
+            sell_signals = (df['signal'] == -1).sum()
+            print(f"[策略层] 三均线信号生成完成 | 买入信号数: {buy_signals}, 卖出信号数: {sell_signals}")
         
         return df
 
@@ -82,11 +95,11 @@ class MomentumStrategy(BaseStrategy):
         self.momentum_period = config.get('momentum_period', 20)
         self.threshold = config.get('momentum_threshold', 0.05)  # 5%涨幅阈值
         
-        print(f"[策略层] 初始化 {self.strategy_name} 策略")
-        print(f"  动量周期: {self.momentum_period} 日")
-        print(f"  阈值: {self.threshold*100}%")
+        if self.verbose:
+            print(f"[策略层] 初始化 {self.strategy_name} 策略 | 动量周期: {self.momentum_period} 日, 阈值: {self.threshold*100}%")
     
-    def generate_signals(self, data):
+    @cached_signals
+    def generate_signals(self, data, cache=None):
         """
         生成动量交易信号
         
@@ -94,41 +107,46 @@ class MomentumStrategy(BaseStrategy):
         - 价格动量>阈值: 买入 (强势上涨)
         - 价格动量<-阈值: 卖出 (转为下跌)
         """
-        print(f"[策略层] 开始生成动量信号...")
-        
         self._validate_data(data)
-        df = data.copy()
+        
+        # 数据量不足时直接返回，不做任何计算
+        required = self.momentum_period + 5
+        if len(data) < required:
+            if self.verbose:
+                print(f"[策略层] 数据量不足: {len(data)} < {required}")
+            return pd.DataFrame()
         
         # 计算动量 (当前价格相对N日前的涨跌幅)
-        df['Momentum'] = df['Close'].pct_change(periods=self.momentum_period)
+        momentum = data['Close'].pct_change(periods=self.momentum_period)
         
         # 计算移动平均动量作为趋势确认
-        df['Momentum_MA'] = df['Momentum'].rolling(window=5).mean()
-        
-        # 生成信号
-        df['signal'] = 0
+        momentum = momentum.to_numpy()
+        momentum_ma = bn.move_mean(momentum, 5, min_count=5)
         
         # 买入: 动量强劲上升
-        buy_condition = (df['Momentum'] > self.threshold) & (df['Momentum_MA'] > 0)
-        df.loc[buy_condition, 'signal'] = 1
+        buy_condition = (momentum > self.threshold) & (momentum_ma > 0)
         
         # 卖出: 动量转负
-        sell_condition = (df['Momentum'] < -self.threshold) | (df['Momentum_MA'] < -self.threshold/2)
-        df.loc[sell_condition, 'signal'] = -1
+        sell_condition = (momentum < -self.threshold) | (momentum_ma < -self.threshold/2)
+        
+        signal = np.where(sell_condition, -1, np.where(buy_condition, 1, 0)).astype(np.int8)
         
         # 只在信号变化时触发
-        df['prev_signal'] = df['signal'].shift(1)
-        df.loc[df['signal'] == df['prev_signal'], 'signal'] = 0
-        df = df.drop('prev_signal', axis=1)
+        signal = keep_signal_changes(signal)
         
-        df = df.dropna()
+        # 去掉预热期 (动量需N日，动量均线再需5日)
+        valid_start = self.momentum_period + 5 - 1
         
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
+        df = data.assign(
+            Momentum=momentum,
+            Momentum_MA=momentum_ma,
+            signal=signal,
+        ).iloc[valid_start:]
         
-        print(f"[策略层] 动量信号生成完成")
-        print(f"  买入信号数: {buy_signals}")
-        print(f"  卖出信号数: {sell_signals}")
+        if self.verbose:
+            buy_signals = (df['signal'] == 1).sum()
+            sell_signals = (df['signal'] == -1).sum()
+            print(f"[策略层] 动量信号生成完成 | 买入信号数: {buy_signals}, 卖出信号数: {sell_signals}")
         
         return df
 
@@ -145,11 +163,11 @@ class TurtleTradingStrategy(BaseStrategy):
         self.entry_period = config.get('turtle_entry', 20)  # 入场周期
         self.exit_period = config.get('turtle_exit', 10)    # 出场周期
         
-        print(f"[策略层] 初始化 {self.strategy_name} 策略")
-        print(f"  入场周期: {self.entry_period} 日")
-        print(f"  出场周期: {self.exit_period} 日")
+        if self.verbose:
+            print(f"[策略层] 初始化 {self.strategy_name} 策略 | 入场周期: {self.entry_period} 日, 出场周期: {self.exit_period} 日")
     
-    def generate_signals(self, data):
+    @cached_signals
+    def generate_signals(self, data, cache=None):
         """
         生成海龟交易信号
         
@@ -157,38 +175,59 @@ class TurtleTradingStrategy(BaseStrategy):
         - 突破N日最高价: 买入
         - 跌破M日最低价: 卖出
         """
-        print(f"[策略层] 开始生成海龟交易信号...")
-        
         self._validate_data(data)
-        df = data.copy()
+        
+        # 数据量不足时直接返回，不做任何计算
+        required = max(self.entry_period, self.exit_period)
+        if len(data) < required:
+            if self.verbose:
+                print(f"[策略层] 数据量不足: {len(data)} < {required}")
+            return pd.DataFrame()
+        
+        high = self._price_array(data, 'High')
+        low = self._price_array(data, 'Low')
         
         # 计算入场通道 (N日最高/最低)
-        df['Entry_High'] = df['High'].rolling(window=self.entry_period).max()
-        df['Entry_Low'] = df['Low'].rolling(window=self.entry_period).min()
+        entry_high = bn.move_max(high, self.entry_period, min_count=self.entry_period)
+        entry_low = bn.move_min(low, self.entry_period, min_count=self.entry_period)
         
         # 计算出场通道 (M日最高/最低)
-        df['Exit_High'] = df['High'].rolling(window=self.exit_period).max()
-        df['Exit_Low'] = df['Low'].rolling(window=self.exit_period).min()
+        exit_high = bn.move_max(high, self.exit_period, min_count=self.exit_period)
+        exit_low = bn.move_min(low, self.exit_period, min_count=self.exit_period)
+        
+        # 通道取前一日的值，避免使用当日价格
+        prev_entry_high = np.empty_like(entry_high)
+        prev_entry_high[0] = np.nan
+        prev_entry_high[1:] = entry_high[:-1]
+        prev_exit_low = np.empty_like(exit_low)
+        prev_exit_low[0] = np.nan
+        prev_exit_low[1:] = exit_low[:-1]
         
-        # 生成信号
-        df['signal'] = 0
+        close = self._price_array(data, 'Close')
         
         # 买入: 突破入场通道上轨
-        buy_condition = (df['Close'] > df['Entry_High'].shift(1))
-        df.loc[buy_condition, 'signal'] = 1
+        buy_condition = close > prev_entry_high
         
         # 卖出: 跌破出场通道下轨
-        sell_condition = (df['Close'] < df['Exit_Low'].shift(1))
-        df.loc[sell_condition, 'signal'] = -1
+        sell_condition = close < prev_exit_low
+        
+        signal = np.where(sell_condition, -1, np.where(buy_condition, 1, 0)).astype(np.int8)
         
-        df = df.dropna()
+        # 去掉通道预热期
+        valid_start = max(self.entry_period, self.exit_period) - 1
         
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
+        df = data.assign(
+            Entry_High=entry_high,
+            Entry_Low=entry_low,
+            Exit_High=exit_high,
+            Exit_Low=exit_low,
+            signal=signal,
+        ).iloc[valid_start:]
         
-        print(f"[策略层] 海龟交易信号生成完成")
-        print(f"  买入信号数: {buy_signals}")
-        print(f"  卖出信号数: {sell_signals}")
+        if self.verbose:
+            buy_signals = (df['signal'] == 1).sum()
+            sell_signals = (df['signal'] == -1).sum()
+            print(f"[策略层] 海龟交易信号生成完成 | 买入信号数: {buy_signals}, 卖出信号数: {sell_signals}")
         
         return df
 
@@ -205,11 +244,11 @@ class MeanReversionStrategy(BaseStrategy):
         self.lookback_period = config.get('mean_reversion_period', 20)
         self.entry_std = config.get('mean_reversion_std', 2)  # 偏离标准差倍数
         
-        print(f"[策略层] 初始化 {self.strategy_name} 策略")
-        print(f"  回看周期: {self.lookback_period} 日")
-        print(f"  标准差倍数: {self.entry_std}")
+        if self.verbose:
+            print(f"[策略层] 初始化 {self.strategy_name} 策略 | 回看周期: {self.lookback_period} 日, 标准差倍数: {self.entry_std}")
     
-    def generate_signals(self, data):
+    @cached_signals
+    def generate_signals(self, data, cache=None):
         """
         生成均值回归信号
         
@@ -217,45 +256,66 @@ class MeanReversionStrategy(BaseStrategy):
         - 价格低于均值-N倍标准差: 买入 (超跌)
         - 价格高于均值+N倍标准差: 卖出 (超涨)
         """
-        print(f"[策略层] 开始生成均值回归信号...")
-        
         self._validate_data(data)
-        df = data.copy()
-        
-        # 计算移动平均和标准差
-        df['MA'] = df['Close'].rolling(window=self.lookback_period).mean()
-        df['Std'] = df['Close'].rolling(window=self.lookback_period).std()
         
-        # 计算上下轨
-        df['Upper_Band'] = df['MA'] + self.entry_std * df['Std']
-        df['Lower_Band'] = df['MA'] - self.entry_std * df['Std']
+        # 数据量不足时直接返回，不做任何计算
+        required = self.lookback_period
+        if len(data) < required:
+            if self.verbose:
+                print(f"[策略层] 数据量不足: {len(data)} < {required}")
+            return pd.DataFrame()
         
-        # 计算价格偏离度
-        df['Deviation'] = (df['Close'] - df['MA']) / df['Std']
+        if cache is None:
+            cache = IndicatorCache()
+        close = self._price_array(data, 'Close')
         
-        # 生成信号
-        df['signal'] = 0
+        # 计算移动平均和标准差
+        ma = cache.sma(close, self.lookback_period)
+        std = bn.move_std(close, self.lookback_period, min_count=self.lookback_period, ddof=1)
+        
+        # 计算上下轨 (带宽只计算一次)
+        band = self.entry_std * std
+        upper_band = ma + band
+        lower_band = ma - band
+        
+        # 防止除零：平坦窗口 (窗口内最高价等于最低价) 的标准差理论上为0，
+        # 但滑动累加的舍入残差会留下约 sqrt(eps) * 价格的微小值，与均线的微小误差相除
+        # 会得到 ±inf 或无意义的偏离度并触发错误信号。按窗口极差精确判断平坦，偏离度记为 NaN
+        window = self.lookback_period
+        flat = bn.move_max(close, window, min_count=window) == bn.move_min(close, window, min_count=window)
+        divisor = std.copy()
+        divisor[flat | (divisor == 0)] = np.nan
+        
+        # 计算价格偏离度，原地运算避免中间数组
+        deviation = close - ma
+        np.divide(deviation, divisor, out=deviation)
         
         # 买入: 价格严重偏离均值下方
-        buy_condition = df['Deviation'] < -self.entry_std
-        df.loc[buy_condition, 'signal'] = 1
+        buy_condition = deviation < -self.entry_std
         
         # 卖出: 价格回归均值或超过均值
-        sell_condition = (df['Deviation'] > 0) | (df['Deviation'] > self.entry_std)
-        df.loc[sell_condition, 'signal'] = -1
-        
-        # 只在信号变化时触发
-        df['prev_signal'] = df['signal'].shift(1)
-        df.loc[df['signal'] == df['prev_signal'], 'signal'] = 0
-        df = df.drop('prev_signal', axis=1)
+        sell_condition = (deviation > 0) | (deviation > self.entry_std)
         
-        df = df.dropna()
+        signal = np.where(sell_condition, -1, np.where(buy_condition, 1, 0)).astype(np.int8)
         
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
-        
-        print(f"[策略层] 均值回归信号生成完成")
-        print(f"  买入信号数: {buy_signals}")
-        print(f"  卖出信号数: {sell_signals}")
+        # 只在信号变化时触发
+        signal = keep_signal_changes(signal)
+        
+        # 去掉回看窗口预热期
+        valid_start = self.lookback_period - 1
+        
+        df = data.assign(
+            MA=ma,
+            Std=std,
+            Upper_Band=upper_band,
+            Lower_Band=lower_band,
+            Deviation=deviation,
+            signal=signal,
+        ).iloc[valid_start:]
+        
+        if self.verbose:
+            buy_signals = (df['signal'] == 1).sum()
+            sell_signals = (df['signal'] == -1).sum()
+            print(f"[策略层] 均值回归信号生成完成 | 买入信号数: {buy_signals}, 卖出信号数: {sell_signals}")
         
         return df
@@ -6,13 +6,34 @@
 
 import pandas as pd
 import numpy as np
+import bottleneck as bn
 import logging
-from typing import Dict, Tuple
-from .base_strategy import BaseStrategy
+from typing import Dict, Optional, Tuple
+from .base_strategy import BaseStrategy, cached_signals
+from .indicators import (
+    IndicatorCache, ewma, macd_kernel, crossings, long_only_signals, kdj_signals,
+    KDJ_EXIT_STOP_LOSS, KDJ_EXIT_TAKE_PROFIT, KDJ_EXIT_TRAILING_STOP, KDJ_EXIT_OVERBOUGHT
+)
 
 # 配置日志
 logger = logging.getLogger(__name__)
 
+# KDJ卖出原因代码对应的说明
+KDJ_EXIT_REASONS = {
+    KDJ_EXIT_STOP_LOSS: "固定止损",
+    KDJ_EXIT_TAKE_PROFIT: "固定止盈",
+    KDJ_EXIT_TRAILING_STOP: "移动止损",
+    KDJ_EXIT_OVERBOUGHT: "KDJ超买",
+}
+
+def _log_signal_summary(name: str, df: pd.DataFrame, extra: str = "") -> None:
+    """输出一条信号统计汇总 (INFO级别未开启时不做统计)"""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    signal = df['signal'].to_numpy()
+    logger.info("%s信号生成完成 | 买入信号数: %d, 卖出信号数: %d, 有效数据: %d 条%s",
+                name, np.count_nonzero(signal == 1), np.count_nonzero(signal == -1), len(df), extra)
+
 class DualMovingAverageStrategy(BaseStrategy):
     """
     双均线策略 - 经典的趋势跟踪策略
@@ -37,11 +58,13 @@ class DualMovingAverageStrategy(BaseStrategy):
         if self.short_window >= self.long_window:
             raise ValueError(f"短期窗口({self.short_window})必须小于长期窗口({self.long_window})")
         
-        logger.info(f"初始化 {self.strategy_name} 策略")
-        logger.info(f"  短期均线: {self.short_window} 日")
-        logger.info(f"  长期均线: {self.long_window} 日")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("初始化 %s 策略 | 短期均线: %d 日, 长期均线: %d 日",
+                        self.strategy_name, self.short_window, self.long_window)
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+    @cached_signals
+    def generate_signals(self, data: pd.DataFrame,
+                         cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
         """
         生成双均线交易信号
         
@@ -52,57 +75,94 @@ class DualMovingAverageStrategy(BaseStrategy):
         
         Args:
             data: pd.DataFrame, 股票OHLCV数据
+            cache: IndicatorCache, 可选, 多策略共享的指标缓存
             
         Returns:
             pd.DataFrame: 添加了信号和均线的数据
         """
-        logger.info("开始生成双均线交易信号...")
-        
         # 验证数据
         self._validate_data(data)
         
         # 检查数据量是否足够
         if len(data) < self.long_window:
-            logger.warning(f"数据量不足: {len(data)} < {self.long_window}")
+            if self.verbose:
+                logger.warning(f"数据量不足: {len(data)} < {self.long_window}")
             return pd.DataFrame()
         
-        # 创建数据副本
-        df = data.copy()
-        
         # 计算移动平均线
-        df['MA_Short'] = df['Close'].rolling(window=self.short_window, min_periods=self.short_window).mean()
-        df['MA_Long'] = df['Close'].rolling(window=self.long_window, min_periods=self.long_window).mean()
-        
-        # 初始化信号列
-        df['signal'] = 0
+        if cache is None:
+            cache = IndicatorCache()
+        close = self._price_array(data, 'Close')
+        ma_short = cache.sma(close, self.short_window)
+        ma_long = cache.sma(close, self.long_window)
         
         # ✅ 修复：使用向量化操作检测交叉
-        # 前一天短期均线 <= 长期均线 且 当天短期均线 > 长期均线 => 金叉
-        golden_cross = (
-            (df['MA_Short'] > df['MA_Long']) & 
-            (df['MA_Short'].shift(1) <= df['MA_Long'].shift(1))
-        )
+        # 金叉: 前一天短期均线 <= 长期均线 且 当天短期均线 > 长期均线
+        # 死叉: 前一天短期均线 >= 长期均线 且 当天短期均线 < 长期均线
+        golden_cross, death_cross = crossings(ma_short, ma_long)
         
-        # 前一天短期均线 >= 长期均线 且 当天短期均线 < 长期均线 => 死叉
-        death_cross = (
-            (df['MA_Short'] < df['MA_Long']) & 
-            (df['MA_Short'].shift(1) >= df['MA_Long'].shift(1))
-        )
+        signal = np.where(death_cross, -1, np.where(golden_cross, 1, 0)).astype(np.int8)
         
-        df.loc[golden_cross, 'signal'] = 1
-        df.loc[death_cross, 'signal'] = -1
+        # 去掉长期均线预热期 (之前均线为NaN)
+        df = data.assign(
+            MA_Short=ma_short,
+            MA_Long=ma_long,
+            signal=signal,
+        ).iloc[self.long_window - 1:]
         
-        # 删除无效数据
-        df = df.dropna()
+        if self.verbose:
+            _log_signal_summary("双均线", df)
         
-        # 统计信号
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
+        return df
+    
+    @classmethod
+    def generate_signals_batch(cls, data: pd.DataFrame, config: Dict,
+                               ticker_col: str = 'symbol') -> pd.DataFrame:
+        """
+        批量生成多只股票的双均线信号
         
-        logger.info("双均线信号生成完成")
-        logger.info(f"  买入信号数: {buy_signals}")
-        logger.info(f"  卖出信号数: {sell_signals}")
-        logger.info(f"  有效数据: {len(df)} 条")
+        均线与交叉均在 groupby 分组内计算，一次处理整张长表，
+        结果与逐只调用 generate_signals 一致
+        
+        Args:
+            data: pd.DataFrame, 多只股票的OHLCV数据, 以 ticker_col 列区分股票
+            config: 策略配置字典
+            ticker_col: 股票代码列名
+            
+        Returns:
+            pd.DataFrame: 添加了信号和均线的数据
+        """
+        strategy = cls(config)
+        strategy._validate_data(data)
+        short_window = strategy.short_window
+        long_window = strategy.long_window
+        
+        def moving_average(close: pd.Series, window: int) -> np.ndarray:
+            # 数据量不足一个窗口的股票整段为NaN, 随后被 dropna 剔除
+            if len(close) < window:
+                return np.full(len(close), np.nan)
+            return bn.move_mean(close.to_numpy(dtype=np.float64), window, min_count=window)
+        
+        grouped = data.groupby(ticker_col, sort=False, observed=True)
+        ma_short = grouped['Close'].transform(moving_average, short_window)
+        ma_long = grouped['Close'].transform(moving_average, long_window)
+        
+        # 均线差值的前一日值只在同一只股票内平移
+        diff = ma_short - ma_long
+        prev_diff = diff.groupby(data[ticker_col], sort=False, observed=True).shift(1)
+        
+        golden_cross = (diff > 0) & (prev_diff <= 0)
+        death_cross = (diff < 0) & (prev_diff >= 0)
+        signal = np.where(death_cross, -1, np.where(golden_cross, 1, 0)).astype(np.int8)
+        
+        df = data.assign(
+            MA_Short=ma_short,
+            MA_Long=ma_long,
+            signal=signal,
+        ).dropna()
+        
+        if strategy.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("双均线批量信号生成完成 | %d 只股票, 有效数据: %d 条", df[ticker_col].nunique(), len(df))
         
         return df
 
@@ -122,12 +182,13 @@ class MACDStrategy(BaseStrategy):
         if self.fast_period >= self.slow_period:
             raise ValueError(f"快线周期({self.fast_period})必须小于慢线周期({self.slow_period})")
         
-        logger.info(f"初始化 {self.strategy_name} 策略")
-        logger.info(f"  快线周期: {self.fast_period} 日")
-        logger.info(f"  慢线周期: {self.slow_period} 日")
-        logger.info(f"  信号线周期: {self.signal_period} 日")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("初始化 %s 策略 | 快线周期: %d 日, 慢线周期: %d 日, 信号线周期: %d 日",
+                        self.strategy_name, self.fast_period, self.slow_period, self.signal_period)
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+    @cached_signals
+    def generate_signals(self, data: pd.DataFrame,
+                         cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
         """
         生成MACD交易信号
         
@@ -135,48 +196,32 @@ class MACDStrategy(BaseStrategy):
         - MACD上穿信号线: 买入信号 (1)
         - MACD下穿信号线: 卖出信号 (-1)
         """
-        logger.info("开始生成MACD信号...")
-        
         self._validate_data(data)
         
         if len(data) < self.slow_period + self.signal_period:
-            logger.warning(f"数据量不足")
+            if self.verbose:
+                logger.warning(f"数据量不足")
             return pd.DataFrame()
         
-        df = data.copy()
-        
-        # 计算MACD
-        exp1 = df['Close'].ewm(span=self.fast_period, adjust=False).mean()
-        exp2 = df['Close'].ewm(span=self.slow_period, adjust=False).mean()
-        
-        df['MACD'] = exp1 - exp2
-        df['Signal_Line'] = df['MACD'].ewm(span=self.signal_period, adjust=False).mean()
-        df['MACD_Hist'] = df['MACD'] - df['Signal_Line']
-        
-        # ✅ 修复：使用向量化检测交叉
-        df['signal'] = 0
-        
-        macd_cross_up = (
-            (df['MACD'] > df['Signal_Line']) & 
-            (df['MACD'].shift(1) <= df['Signal_Line'].shift(1))
+        # 计算MACD (快线、慢线、信号线、柱状图及交叉单次遍历完成)
+        macd, signal_line, hist, macd_cross_up, macd_cross_down = macd_kernel(
+            self._price_array(data, 'Close'),
+            self.fast_period, self.slow_period, self.signal_period
         )
         
-        macd_cross_down = (
-            (df['MACD'] < df['Signal_Line']) & 
-            (df['MACD'].shift(1) >= df['Signal_Line'].shift(1))
+        # ✅ 修复：使用向量化检测交叉
+        signal = np.where(macd_cross_down, -1, np.where(macd_cross_up, 1, 0)).astype(np.int8)
+        
+        # MACD以首日收盘价为EMA初始值，没有预热期NaN
+        df = data.assign(
+            MACD=macd,
+            Signal_Line=signal_line,
+            MACD_Hist=hist,
+            signal=signal,
         )
         
-        df.loc[macd_cross_up, 'signal'] = 1
-        df.loc[macd_cross_down, 'signal'] = -1
-        
-        df = df.dropna()
-        
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
-        
-        logger.info("MACD信号生成完成")
-        logger.info(f"  买入信号数: {buy_signals}")
-        logger.info(f"  卖出信号数: {sell_signals}")
+        if self.verbose:
+            _log_signal_summary("MACD", df)
         
         return df
 
@@ -195,12 +240,14 @@ class BollingerBandsStrategy(BaseStrategy):
         self.lower_threshold = config.get('bb_lower_threshold', 0.2)
         self.upper_threshold = config.get('bb_upper_threshold', 0.8)
         
-        logger.info(f"初始化 {self.strategy_name} 策略")
-        logger.info(f"  周期: {self.bb_period} 日")
-        logger.info(f"  标准差倍数: {self.bb_std}")
-        logger.info(f"  下轨阈值: {self.lower_threshold}, 上轨阈值: {self.upper_threshold}")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("初始化 %s 策略 | 周期: %d 日, 标准差倍数: %s, 下轨阈值: %s, 上轨阈值: %s",
+                        self.strategy_name, self.bb_period, self.bb_std,
+                        self.lower_threshold, self.upper_threshold)
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+    @cached_signals
+    def generate_signals(self, data: pd.DataFrame,
+                         cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
         """
         生成布林带交易信号
         
@@ -208,61 +255,66 @@ class BollingerBandsStrategy(BaseStrategy):
         - 价格位置 < lower_threshold: 买入信号 (超卖)
         - 价格位置 > upper_threshold: 卖出信号 (超买)
         """
-        logger.info("开始生成布林带信号...")
-        
         self._validate_data(data)
         
         if len(data) < self.bb_period:
-            logger.warning("数据量不足")
+            if self.verbose:
+                logger.warning("数据量不足")
             return pd.DataFrame()
         
-        df = data.copy()
-        
         # 计算布林带
-        df['BB_Middle'] = df['Close'].rolling(window=self.bb_period, min_periods=self.bb_period).mean()
-        df['BB_Std'] = df['Close'].rolling(window=self.bb_period, min_periods=self.bb_period).std()
-        df['BB_Upper'] = df['BB_Middle'] + (df['BB_Std'] * self.bb_std)
-        df['BB_Lower'] = df['BB_Middle'] - (df['BB_Std'] * self.bb_std)
+        close = self._price_array(data, 'Close')
+        bb_middle, bb_std = self._rolling_mean_std(close, self.bb_period)
+        bb_upper = bb_middle + bb_std * self.bb_std
+        bb_lower = bb_middle - bb_std * self.bb_std
         
         # ✅ 修复：防止除零
-        band_width = df['BB_Upper'] - df['BB_Lower']
-        band_width = band_width.replace(0, np.nan)
+        band_width = bb_upper - bb_lower
+        band_width[band_width == 0] = np.nan
         
         # 计算价格相对位置 (0-1之间)
-        df['BB_Position'] = (df['Close'] - df['BB_Lower']) / band_width
+        bb_position = (close - bb_lower) / band_width
         
         # ✅ 修复：使用状态机避免重复信号
-        df['signal'] = 0
-        df['position'] = 0  # 0=空仓, 1=持仓
-        
-        # 向量化生成初始信号
-        oversold = df['BB_Position'] < self.lower_threshold
-        overbought = df['BB_Position'] > self.upper_threshold
-        
-        # 使用循环处理状态转换（必要的，因为需要记录持仓状态）
-        position = 0
-        for i in range(len(df)):
-            if position == 0:  # 空仓
-                if oversold.iloc[i]:
-                    df.iloc[i, df.columns.get_loc('signal')] = 1
-                    position = 1
-            else:  # 持仓
-                if overbought.iloc[i]:
-                    df.iloc[i, df.columns.get_loc('signal')] = -1
-                    position = 0
-        
-        df = df.drop('position', axis=1)
-        df = df.dropna()
-        
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
-        
-        logger.info("布林带信号生成完成")
-        logger.info(f"  买入信号数: {buy_signals}")
-        logger.info(f"  卖出信号数: {sell_signals}")
+        oversold = bb_position < self.lower_threshold
+        overbought = bb_position > self.upper_threshold
+        
+        signal = long_only_signals(oversold, overbought)
+        
+        # 去掉布林带窗口预热期
+        df = data.assign(
+            BB_Middle=bb_middle,
+            BB_Std=bb_std,
+            BB_Upper=bb_upper,
+            BB_Lower=bb_lower,
+            BB_Position=bb_position,
+            signal=signal,
+        ).iloc[self.bb_period - 1:]
+        
+        if self.verbose:
+            _log_signal_summary("布林带", df)
         
         return df
 
+    @staticmethod
+    def _rolling_mean_std(close: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        由滑动和与滑动平方和同时得到均值和样本标准差 (ddof=1)
+        
+        var = (sum(x²) - sum(x)²/w) / (w-1)，先减去首个价格再求和，
+        避免价格量级较大时的相减抵消误差
+        """
+        shift = close[0] if len(close) else 0.0
+        centered = close - shift
+        window_sum = bn.move_sum(centered, window, min_count=window)
+        window_sumsq = bn.move_sum(centered * centered, window, min_count=window)
+        
+        mean = window_sum / window
+        var = (window_sumsq - window_sum * mean) / (window - 1)
+        std = np.sqrt(np.maximum(var, 0))  # 浮点误差可能产生极小的负数
+        
+        return mean + shift, std
+
 class RSIStrategy(BaseStrategy):
     """
     RSI策略 - 相对强弱指标策略
@@ -279,67 +331,57 @@ class RSIStrategy(BaseStrategy):
         if self.oversold >= self.overbought:
             raise ValueError(f"超卖阈值({self.oversold})必须小于超买阈值({self.overbought})")
         
-        logger.info(f"初始化 {self.strategy_name} 策略")
-        logger.info(f"  RSI周期: {self.rsi_period} 日")
-        logger.info(f"  超卖阈值: {self.oversold}")
-        logger.info(f"  超买阈值: {self.overbought}")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("初始化 %s 策略 | RSI周期: %d 日, 超卖阈值: %s, 超买阈值: %s",
+                        self.strategy_name, self.rsi_period, self.oversold, self.overbought)
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+    @cached_signals
+    def generate_signals(self, data: pd.DataFrame,
+                         cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
         """生成RSI交易信号"""
-        logger.info("开始生成RSI信号...")
-        
         self._validate_data(data)
         
         if len(data) < self.rsi_period + 1:
-            logger.warning("数据量不足")
+            if self.verbose:
+                logger.warning("数据量不足")
             return pd.DataFrame()
         
-        df = data.copy()
-        
         # 计算RSI
-        df['RSI'] = self._calculate_rsi(df['Close'], self.rsi_period)
+        rsi = self._calculate_rsi(self._price_array(data, 'Close'), self.rsi_period)
         
         # ✅ 使用状态机生成信号
-        df['signal'] = 0
-        position = 0
-        
-        for i in range(len(df)):
-            if position == 0:  # 空仓
-                if df.iloc[i]['RSI'] < self.oversold:
-                    df.iloc[i, df.columns.get_loc('signal')] = 1
-                    position = 1
-            else:  # 持仓
-                if df.iloc[i]['RSI'] > self.overbought:
-                    df.iloc[i, df.columns.get_loc('signal')] = -1
-                    position = 0
+        signal = long_only_signals(rsi < self.oversold, rsi > self.overbought)
         
-        df = df.dropna()
+        # RSI缺失值已填充为50，无需再删除行
+        df = data.assign(RSI=rsi, signal=signal)
         
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
-        
-        logger.info("RSI信号生成完成")
-        logger.info(f"  买入信号数: {buy_signals}")
-        logger.info(f"  卖出信号数: {sell_signals}")
+        if self.verbose:
+            _log_signal_summary("RSI", df)
         
         return df
     
-    def _calculate_rsi(self, prices: pd.Series, period: int) -> pd.Series:
+    @staticmethod
+    def _calculate_rsi(close: np.ndarray, period: int) -> np.ndarray:
         """
         计算RSI指标
         
+        涨跌幅直接在NumPy数组上拆分，再用 bottleneck 的滑动均值求平均涨跌
+        
         ✅ 修复：添加除零保护
         """
-        delta = prices.diff()
-        gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-        loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+        delta = np.empty_like(close)
+        delta[0] = 0.0
+        np.subtract(close[1:], close[:-1], out=delta[1:])
+        
+        gain = bn.move_mean(np.maximum(delta, 0.0), period, min_count=period)
+        loss = bn.move_mean(np.maximum(-delta, 0.0), period, min_count=period)
         
         # ✅ 防止除零
-        rs = gain / loss.replace(0, np.nan)
-        rsi = 100 - (100 / (1 + rs))
+        loss[loss == 0] = np.nan
+        rsi = 100 - (100 / (1 + gain / loss))
         
         # 处理特殊情况
-        rsi = rsi.fillna(50)  # loss=0时RSI设为中性值50
+        rsi[np.isnan(rsi)] = 50  # loss=0时RSI设为中性值50
         
         return rsi
 
@@ -372,16 +414,21 @@ class KDJStrategy(BaseStrategy):
         
         # 参数验证
         if self.trailing_stop >= self.stop_loss:
-            logger.warning(f"移动止损({self.trailing_stop})应小于固定止损({self.stop_loss})，已自动调整")
+            if self.verbose:
+                logger.warning(f"移动止损({self.trailing_stop})应小于固定止损({self.stop_loss})，已自动调整")
             self.trailing_stop = self.stop_loss * 0.8
         
-        logger.info(f"初始化 {self.strategy_name} 策略")
-        logger.info(f"  N周期: {self.kdj_n}, M1平滑: {self.kdj_m1}, M2平滑: {self.kdj_m2}")
-        logger.info(f"  超卖阈值: {self.oversold}, 超买阈值: {self.overbought}")
-        logger.info(f"  固定止损: {self.stop_loss*100:.1f}%, 止盈: {self.take_profit*100:.1f}%")
-        logger.info(f"  移动止损: {self.trailing_stop*100:.1f}%, 触发: {self.trailing_trigger*100:.1f}%")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            logger.info("初始化 %s 策略 | N周期: %d, M1平滑: %d, M2平滑: %d, 超卖阈值: %s, 超买阈值: %s, "
+                        "固定止损: %.1f%%, 止盈: %.1f%%, 移动止损: %.1f%%, 触发: %.1f%%",
+                        self.strategy_name, self.kdj_n, self.kdj_m1, self.kdj_m2,
+                        self.oversold, self.overbought,
+                        self.stop_loss * 100, self.take_profit * 100,
+                        self.trailing_stop * 100, self.trailing_trigger * 100)
     
-    def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+    @cached_signals
+    def generate_signals(self, data: pd.DataFrame,
+                         cache: Optional[IndicatorCache] = None) -> pd.DataFrame:
         """
         生成KDJ交易信号
         
@@ -393,96 +440,42 @@ class KDJStrategy(BaseStrategy):
         
         Args:
             data: pd.DataFrame, 股票OHLCV数据
+            cache: IndicatorCache, 可选, 多策略共享的指标缓存
             
         Returns:
             pd.DataFrame: 添加了信号和KDJ指标的数据
         """
-        logger.info("开始生成KDJ交易信号...")
-        
         self._validate_data(data)
         
         if len(data) < self.kdj_n + max(self.kdj_m1, self.kdj_m2):
-            logger.warning(f"数据量不足")
+            if self.verbose:
+                logger.warning(f"数据量不足")
             return pd.DataFrame()
         
-        df = data.copy()
-        
         # 计算KDJ指标
-        df = self._calculate_kdj(df)
-        
-        # 初始化信号和状态
-        df['signal'] = 0
+        k, d, j = self._calculate_kdj(data)
+        
+        # 使用状态机生成信号 (含止损止盈风控)
+        close = self._price_array(data, 'Close')
+        signal, exit_reason = kdj_signals(
+            close, k, d,
+            self.oversold, self.overbought,
+            self.stop_loss, self.take_profit,
+            self.trailing_stop, self.trailing_trigger
+        )
         
-        # 使用状态机生成信号
-        position = 0  # 0=空仓, 1=持仓
-        entry_price = 0  # 买入价格
-        highest_price = 0  # 持仓期间最高价
+        # RSV缺失值已填充为50，K/D/J没有NaN，无需再删除行
+        df = data.assign(K=k, D=d, J=j, signal=signal)
         
-        for i in range(len(df)):
-            current_price = df.iloc[i]['Close']
-            k_value = df.iloc[i]['K']
-            d_value = df.iloc[i]['D']
-            
-            if position == 0:  # 空仓状态
-                # 超卖区域 + K上穿D => 买入
-                if k_value < self.oversold and k_value > d_value:
-                    df.iloc[i, df.columns.get_loc('signal')] = 1
-                    position = 1
-                    entry_price = current_price
-                    highest_price = current_price
-                    
-            else:  # 持仓状态
-                # 更新最高价
-                if current_price > highest_price:
-                    highest_price = current_price
-                
-                # 计算盈亏
-                profit_rate = (current_price - entry_price) / entry_price
-                drawdown = (current_price - highest_price) / highest_price
-                
-                # 卖出条件判断
-                should_sell = False
-                sell_reason = ""
-                
-                # 1. 固定止损
-                if profit_rate <= -self.stop_loss:
-                    should_sell = True
-                    sell_reason = "固定止损"
-                
-                # 2. 固定止盈
-                elif profit_rate >= self.take_profit:
-                    should_sell = True
-                    sell_reason = "固定止盈"
-                
-                # 3. 移动止损（盈利达到触发阈值后启动）
-                elif profit_rate >= self.trailing_trigger and drawdown <= -self.trailing_stop:
-                    should_sell = True
-                    sell_reason = "移动止损"
-                
-                # 4. KDJ信号：超买区域 + K下穿D
-                elif k_value > self.overbought and k_value < d_value:
-                    should_sell = True
-                    sell_reason = "KDJ超买"
-                
-                if should_sell:
-                    df.iloc[i, df.columns.get_loc('signal')] = -1
-                    position = 0
-                    logger.debug(f"卖出 [{sell_reason}]: 价格={current_price:.2f}, 收益率={profit_rate*100:.2f}%")
-        
-        df = df.dropna()
-        
-        # 统计信号
-        buy_signals = (df['signal'] == 1).sum()
-        sell_signals = (df['signal'] == -1).sum()
-        
-        logger.info("KDJ信号生成完成")
-        logger.info(f"  买入信号数: {buy_signals}")
-        logger.info(f"  卖出信号数: {sell_signals}")
-        logger.info(f"  有效数据: {len(df)} 条")
+        if self.verbose and logger.isEnabledFor(logging.INFO):
+            # 卖出原因一次性汇总，不逐笔输出
+            counts = np.bincount(exit_reason, minlength=len(KDJ_EXIT_REASONS) + 1)
+            reasons = ", ".join(f"{label}={counts[code]}" for code, label in KDJ_EXIT_REASONS.items())
+            _log_signal_summary("KDJ", df, f" | 卖出原因: {reasons}")
         
         return df
     
-    def _calculate_kdj(self, data: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_kdj(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
         """
         计算KDJ指标
         
@@ -496,30 +489,25 @@ class KDJStrategy(BaseStrategy):
             data: pd.DataFrame
             
         Returns:
-            pd.DataFrame: 添加了K, D, J列的数据
+            tuple: (K, D, J) 三个 float64 数组
         """
-        df = data.copy()
-        
         # 计算N日最高价和最低价
-        df['Lowest_Low'] = df['Low'].rolling(window=self.kdj_n, min_periods=self.kdj_n).min()
-        df['Highest_High'] = df['High'].rolling(window=self.kdj_n, min_periods=self.kdj_n).max()
+        lowest_low = bn.move_min(self._price_array(data, 'Low'), self.kdj_n, min_count=self.kdj_n)
+        highest_high = bn.move_max(self._price_array(data, 'High'), self.kdj_n, min_count=self.kdj_n)
         
         # 计算RSV (Raw Stochastic Value)
-        denominator = df['Highest_High'] - df['Lowest_Low']
-        denominator = denominator.replace(0, np.nan)  # 防止除零
-        df['RSV'] = (df['Close'] - df['Lowest_Low']) / denominator * 100
-        df['RSV'] = df['RSV'].fillna(50)  # 处理特殊情况
+        denominator = highest_high - lowest_low
+        denominator[denominator == 0] = np.nan  # 防止除零
+        rsv = (self._price_array(data, 'Close') - lowest_low) / denominator * 100
+        rsv[np.isnan(rsv)] = 50  # 处理特殊情况
         
         # 计算K值（RSV的M1日移动平均）
-        df['K'] = df['RSV'].ewm(span=self.kdj_m1, adjust=False).mean()
+        k = ewma(rsv, 2.0 / (self.kdj_m1 + 1))
         
         # 计算D值（K的M2日移动平均）
-        df['D'] = df['K'].ewm(span=self.kdj_m2, adjust=False).mean()
+        d = ewma(k, 2.0 / (self.kdj_m2 + 1))
         
         # 计算J值
-        df['J'] = 3 * df['K'] - 2 * df['D']
-        
-        # 清理临时列
-        df = df.drop(['Lowest_Low', 'Highest_High', 'RSV'], axis=1)
+        j = 3 * k - 2 * d
         
-        return df
+        return k, d, j
@@ -5,4 +5,6 @@ SpeedBroker 测试模块
 - test_akshare.py: AkShare数据源基础测试
 - test_akshare_detailed.py: AkShare数据源详细诊断
 - test_fix.py: 数据获取功能修复验证测试
+- conftest.py: pytest 会话级公共夹具
+- helpers.py: 夹具与脚本共用的辅助函数 (测试配置)
 """
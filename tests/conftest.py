@@ -0,0 +1,47 @@
+"""
+pytest 公共夹具
+数据处理器、akshare 接口和网络探测在整个测试会话中只创建一次，
+akshare 的HTTP请求共用一个连接池 (utils.http_session)
+"""
+
+import socket
+
+import pytest
+
+# test_akshare.py 是纯脚本 (导入即执行网络请求)，不参与 pytest 收集
+collect_ignore = ["test_akshare.py"]
+
+
+@pytest.fixture(scope="session")
+def network():
+    """会话级网络探测，网络不可用时跳过依赖网络的用例"""
+    try:
+        with socket.create_connection(("www.baidu.com", 443), timeout=3):
+            pass
+    except OSError as e:
+        pytest.skip(f"网络不可用: {e}")
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """会话期间 requests 的模块级请求复用长连接，结束时恢复原函数"""
+    from utils.http_session import shared_http_session
+    
+    with shared_http_session():
+        yield
+
+
+@pytest.fixture(scope="session")
+def stock_zh_a_hist(http_session):
+    """akshare 日线接口，未安装 akshare 时跳过"""
+    ak = pytest.importorskip("akshare")
+    return ak.stock_zh_a_hist
+
+
+@pytest.fixture(scope="session")
+def handler(tmp_path_factory, http_session):
+    """共享的数据处理器 (缓存写入本次会话的临时目录)"""
+    from data.data_handler import DataHandler
+    from tests.helpers import build_config
+    
+    return DataHandler(build_config(tmp_path_factory.mktemp("data_cache")))
@@ -0,0 +1,56 @@
+"""
+测试辅助函数
+供 conftest.py 中的夹具、各测试模块和脚本模式共用，不含测试用例
+"""
+
+
+def build_config(cache_dir):
+    """
+    测试用数据配置
+    
+    启用缓存，但缓存写入调用方给出的临时目录：不污染GUI使用的 ./data/cache，
+    也避免上次运行的缓存让 get_data 跳过代码解析
+    
+    Args:
+        cache_dir: 本次运行专用的缓存目录
+    """
+    from config.config import DATA_CONFIG
+    
+    # 构造新字典而非修改副本，DATA_CONFIG 本身保持不变
+    return {
+        **DATA_CONFIG,
+        'start_date': '2024-01-01',
+        'end_date': '2024-10-01',
+        'use_cache': True,
+        'cache_dir': str(cache_dir),
+    }
+
+
+def make_ohlcv(close, start='2020-01-01'):
+    """
+    由收盘价序列构造日频OHLCV数据 (开高低收均取收盘价，成交量为常数)
+    
+    Args:
+        close: 收盘价序列
+        start: 首个交易日
+    """
+    import numpy as np
+    import pandas as pd
+    
+    close = np.asarray(close, dtype=float)
+    index = pd.date_range(start, periods=len(close), freq='B')
+    return pd.DataFrame({
+        'Open': close,
+        'High': close,
+        'Low': close,
+        'Close': close,
+        'Volume': np.full(len(close), 1000.0),
+    }, index=index)
+
+
+def random_walk(n, seed=0, start=100.0):
+    """固定种子的随机游走收盘价"""
+    import numpy as np
+    
+    rng = np.random.default_rng(seed)
+    return start + np.cumsum(rng.normal(0, 1, n))
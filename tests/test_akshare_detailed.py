@@ -1,121 +1,371 @@
 """
 AkShare 数据获取详细测试
 用于诊断数据获取失败的原因
+
+既可直接运行输出诊断报告，也可由 pytest 收集执行:
+    python tests/test_akshare_detailed.py
+    pytest tests/test_akshare_detailed.py -n auto
 """
 
+import asyncio
+import contextlib
+import json
+import os
+import random
+import re
 import sys
+import time
+from datetime import datetime, timedelta
 
-print("=" * 60)
-print("AkShare 数据获取诊断工具")
-print("=" * 60)
+import pytest
 
-# 1. 检查 akshare 是否安装
-print("\n[步骤 1] 检查 akshare 是否安装...")
-try:
-    import akshare as ak
-    print(f"✓ akshare 已安装，版本: {ak.__version__}")
-except ImportError as e:
-    print(f"✗ akshare 未安装: {e}")
-    print("\n解决方案: 请运行以下命令安装 akshare:")
-    print("  pip install akshare --upgrade")
-    sys.exit(1)
-
-# 2. 测试网络连接
-print("\n[步骤 2] 测试网络连接...")
+# akshare 基于 requests 发起请求；未安装时退回内置的网络异常，诊断流程照常运行
 try:
     import requests
-    response = requests.get("https://www.baidu.com", timeout=5)
-    print(f"✓ 网络连接正常 (状态码: {response.status_code})")
-except Exception as e:
-    print(f"✗ 网络连接异常: {e}")
-    print("\n解决方案: 请检查网络连接")
-
-# 3. 测试股票代码格式
-print("\n[步骤 3] 测试股票代码格式转换...")
-test_cases = [
+    RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout)
+except ImportError:
+    RETRYABLE_ERRORS = (ConnectionError, TimeoutError)
+
+# 项目根目录 (脚本可从任意目录运行，导入 utils 时按此定位)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 股票代码格式转换: 600941.SH -> sh600941 (只匹配开头，带名称的代码同样适用)
+_TICKER_RE = re.compile(r'^(\d{6})\.(SZ|SH)')
+_SUFFIX = {'SZ': 'sz', 'SH': 'sh'}
+
+# 代码格式转换用例: (原始代码, 期望结果)
+FORMAT_CASES = [
     ("600941.SH", "sh600941"),
     ("000941.SZ", "sz000941"),
 ]
 
-for original, expected in test_cases:
-    symbol = original.replace('.SZ', '').replace('.SH', '')
-    if original.endswith('.SZ'):
-        symbol = 'sz' + symbol
-    elif original.endswith('.SH'):
-        symbol = 'sh' + symbol
-    
-    status = "✓" if symbol == expected else "✗"
-    print(f"{status} {original} -> {symbol} (期望: {expected})")
-
-# 4. 测试实际数据获取
-print("\n[步骤 4] 测试实际数据获取...")
-print("-" * 60)
-
-test_stocks = [
+# 数据获取测试股票: (代码, 名称)
+TEST_STOCKS = [
     ("600941.SH", "中国移动"),
     ("000001.SZ", "平安银行"),
     ("600000.SH", "浦发银行"),
 ]
 
-for ticker, name in test_stocks:
-    print(f"\n测试股票: {ticker} ({name})")
-    print("-" * 40)
+HIST_COLUMNS = ['日期', '开盘', '收盘', '最高', '最低', '成交量']
+
+# 网络类异常的重试策略: 最多尝试3次，退避 0.5s、1s ... 上限5s，并叠加随机抖动
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 5.0
+
+
+def normalize(ticker):
+    """将 000001.SZ 格式转换为 akshare 使用的 sz000001 格式"""
+    m = _TICKER_RE.match(ticker)
+    return _SUFFIX[m.group(2)] + m.group(1) if m else ticker
+
+
+# 全部用到的代码在导入时统一转换一次，之后各步骤直接查表
+SYMBOL_MAP = {
+    ticker: normalize(ticker)
+    for ticker in dict.fromkeys([t for t, _ in FORMAT_CASES] + [t for t, _ in TEST_STOCKS])
+}
+
+
+def to_symbol(ticker):
+    """查表获取 akshare 代码，表外的代码现场转换"""
+    symbol = SYMBOL_MAP.get(ticker)
+    return symbol if symbol is not None else normalize(ticker)
+
+
+def recent_window(days=14):
+    """诊断只需确认接口可用，取最近两周数据即可 (覆盖长假休市)"""
+    end_date = datetime.today()
+    start_date = end_date - timedelta(days=days)
+    return start_date.strftime('%Y%m%d'), end_date.strftime('%Y%m%d')
+
+
+@contextlib.contextmanager
+def fast_json():
+    """
+    with 块内，orjson 可用时让 requests 的 Response.json() 改用 orjson 解析
+    
+    akshare 的行情接口均通过 Response.json() 解析返回的JSON，
+    这里只替换不带参数的 loads，序列化及带参数的调用仍走标准库；
+    退出 with 块时恢复 requests 原有的 JSON 模块
+    
+    Yields:
+        bool: 是否已启用 orjson
+    """
+    try:
+        import orjson
+        import requests.models
+    except ImportError:
+        yield False
+        return
+    
+    class FastJson:
+        dumps = staticmethod(json.dumps)
+        
+        @staticmethod
+        def loads(s, **kwargs):
+            return json.loads(s, **kwargs) if kwargs else orjson.loads(s)
+    
+    original = requests.models.complexjson
+    requests.models.complexjson = FastJson
+    try:
+        yield True
+    finally:
+        requests.models.complexjson = original
+
+
+def fetch_one(stock_zh_a_hist, ticker, start_date, end_date, stock_info=None):
+    """
+    转换代码格式并获取单只股票数据，异常作为结果返回
     
-    # 转换格式
-    symbol = ticker.replace('.SZ', '').replace('.SH', '')
-    if ticker.endswith('.SZ'):
-        symbol = 'sz' + symbol
-    elif ticker.endswith('.SH'):
-        symbol = 'sh' + symbol
+    传入 stock_info (akshare 的 stock_individual_info_em) 时，
+    行情为空的代码再做一次轻量的个股信息查询，区分"代码不存在"和"区间内无交易"；
+    正常返回数据的代码不产生额外请求
+    """
+    symbol = to_symbol(ticker)
     
-    print(f"  转换后的代码: {symbol}")
+    try:
+        df = fetch_with_retry(stock_zh_a_hist, symbol, start_date, end_date)
+    except Exception as e:
+        return symbol, e
     
+    if stock_info is not None and (df is None or df.empty) and not ticker_exists(stock_info, ticker):
+        return symbol, LookupError(f"股票代码 {ticker} 不存在")
+    return symbol, df
+
+
+def ticker_exists(stock_info, ticker):
+    """个股信息查询有结果即认为代码存在；查询本身失败时不下结论"""
+    m = _TICKER_RE.match(ticker)
+    if m is None:
+        return True
     try:
-        # 尝试获取数据
-        df = ak.stock_zh_a_hist(
-            symbol=symbol,
-            period="daily",
-            start_date="20230101",
-            end_date="20241001",
-            adjust="qfq"
+        return not stock_info(symbol=m.group(1)).empty
+    except Exception:
+        return True
+
+
+def fetch_with_retry(stock_zh_a_hist, symbol, start_date, end_date):
+    """
+    调用 stock_zh_a_hist，连接失败和超时按指数退避重试
+    
+    只重试 requests 的 ConnectionError/Timeout；HTTP 错误状态 (HTTPError，同为 OSError 子类)
+    及其他异常 (如代码不存在、接口变化) 重试无益，直接抛出
+    """
+    for attempt in range(MAX_ATTEMPTS):
+        try:
+            return stock_zh_a_hist(
+                symbol=symbol,
+                period="daily",
+                start_date=start_date,
+                end_date=end_date,
+                adjust="qfq"
+            )
+        except RETRYABLE_ERRORS:
+            if attempt == MAX_ATTEMPTS - 1:
+                raise
+            delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt)
+            time.sleep(delay + random.uniform(0, delay))
+
+
+async def probe_network(host="www.baidu.com", port=443, timeout=3):
+    """只需确认能建立TCP连接，无需完成TLS握手和HTTP请求"""
+    _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def iter_fetches(stock_zh_a_hist, stocks, start_date, end_date, stock_info=None):
+    """
+    并发获取多只股票数据，按完成顺序逐个产出 ((代码, 名称), (转换后代码, 结果))
+    
+    stock_zh_a_hist 是同步接口，交给事件循环的默认执行器运行；
+    先完成的先产出，调用方处理完即可释放，不必等最慢的一次、也不在内存中累积全部结果
+    """
+    loop = asyncio.get_running_loop()
+    
+    async def fetch(stock):
+        return stock, await loop.run_in_executor(
+            None, fetch_one, stock_zh_a_hist, stock[0], start_date, end_date, stock_info
         )
-        
-        if df is None or df.empty:
-            print(f"  ✗ 返回空数据")
-        else:
-            print(f"  ✓ 成功获取 {len(df)} 条记录")
-            print(f"  列名: {df.columns.tolist()}")
-            print(f"  日期范围: {df['日期'].min()} 至 {df['日期'].max()}")
-            print(f"  数据示例 (前3行):")
-            print(df.head(3)[['日期', '开盘', '收盘', '最高', '最低', '成交量']])
-            
+    
+    for next_done in asyncio.as_completed([fetch(stock) for stock in stocks]):
+        yield await next_done
+
+
+# ---------------------------------------------------------------------------
+# pytest 用例
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('original,expected', FORMAT_CASES)
+def test_normalize(original, expected):
+    assert normalize(original) == expected
+
+
+@pytest.mark.parametrize('ticker,name', TEST_STOCKS)
+def test_fetch(stock_zh_a_hist, network, ticker, name):
+    start_date, end_date = recent_window()
+    symbol, result = fetch_one(stock_zh_a_hist, ticker, start_date, end_date)
+    
+    if isinstance(result, Exception):
+        raise result
+    assert result is not None and not result.empty, f"{ticker} ({name}) 返回空数据"
+    assert set(HIST_COLUMNS) <= set(result.columns)
+
+
+class _FailingHist:
+    """按给定异常失败的 stock_zh_a_hist 替身，记录调用次数"""
+    
+    def __init__(self, error):
+        self.error = error
+        self.calls = 0
+    
+    def __call__(self, **kwargs):
+        self.calls += 1
+        raise self.error
+
+
+def test_fetch_with_retry_does_not_retry_http_error():
+    requests = pytest.importorskip("requests")
+    stub = _FailingHist(requests.HTTPError("502 Server Error"))
+    
+    with pytest.raises(requests.HTTPError):
+        fetch_with_retry(stub, "sz000001", "20240101", "20240110")
+    assert stub.calls == 1
+
+
+@pytest.mark.parametrize('error_name', ['ConnectionError', 'Timeout'])
+def test_fetch_with_retry_retries_network_errors(monkeypatch, error_name):
+    requests = pytest.importorskip("requests")
+    error_type = getattr(requests, error_name)
+    stub = _FailingHist(error_type("网络异常"))
+    monkeypatch.setattr(time, 'sleep', lambda _: None)
+    
+    with pytest.raises(error_type):
+        fetch_with_retry(stub, "sz000001", "20240101", "20240110")
+    assert stub.calls == MAX_ATTEMPTS
+
+
+
+def test_fast_json_restores_requests_json():
+    pytest.importorskip("orjson")
+    models = pytest.importorskip("requests.models")
+    original = models.complexjson
+    
+    with fast_json() as enabled:
+        assert enabled
+        assert models.complexjson.loads('{"收盘": 1.5}') == {"收盘": 1.5}
+    assert models.complexjson is original
+
+
+# ---------------------------------------------------------------------------
+# 脚本模式: 输出完整诊断报告
+# ---------------------------------------------------------------------------
+
+async def main():
+    print("=" * 60)
+    print("AkShare 数据获取诊断工具")
+    print("=" * 60)
+    
+    # 1. 检查 akshare 是否安装
+    print("\n[步骤 1] 检查 akshare 是否安装...")
+    try:
+        import akshare as ak
+        from akshare import stock_zh_a_hist
+        # 旧版本 akshare 没有个股信息接口，此时跳过存在性检查
+        stock_info = getattr(ak, 'stock_individual_info_em', None)
+        print(f"✓ akshare 已安装，版本: {ak.__version__}")
+    except ImportError as e:
+        print(f"✗ akshare 未安装: {e}")
+        print("\n解决方案: 请运行以下命令安装 akshare:")
+        print("  pip install akshare --upgrade")
+        sys.exit(1)
+    
+    # 请求复用长连接的工具位于项目 utils 包；导入失败不影响诊断，照常逐次建立连接
+    if REPO_ROOT not in sys.path:
+        sys.path.append(REPO_ROOT)
+    try:
+        from utils.http_session import shared_http_session
+    except ImportError:
+        shared_http_session = contextlib.nullcontext
+    
+    # 2. 测试网络连接
+    print("\n[步骤 2] 测试网络连接...")
+    try:
+        await probe_network()
+        print(f"✓ 网络连接正常")
     except Exception as e:
-        print(f"  ✗ 获取失败: {type(e).__name__}: {str(e)}")
-
-# 5. 给出诊断结果和建议
-print("\n" + "=" * 60)
-print("诊断完成")
-print("=" * 60)
-
-print("\n可能的问题和解决方案:")
-print("1. 如果网络连接异常:")
-print("   - 检查网络连接")
-print("   - 检查防火墙设置")
-print("   - 考虑使用代理")
-
-print("\n2. 如果 akshare 版本过旧:")
-print("   - 运行: pip install akshare --upgrade")
-
-print("\n3. 如果股票代码错误:")
-print("   - 上海股票使用 .SH 后缀 (如 600941.SH)")
-print("   - 深圳股票使用 .SZ 后缀 (如 000001.SZ)")
-
-print("\n4. 如果数据返回空:")
-print("   - 检查股票代码是否正确")
-print("   - 检查日期范围是否合理")
-print("   - 该股票可能在指定日期范围内停牌")
-
-print("\n5. 如果提示'没有成功获取任何股票数据':")
-print("   - 股票代码可能不存在")
-print("   - 尝试使用其他常见股票代码测试")
-print("   - 检查 akshare 接口是否有变化")
+        print(f"✗ 网络连接异常: {e}")
+        print("\n解决方案: 请检查网络连接")
+    
+    # 3. 测试股票代码格式
+    print("\n[步骤 3] 测试股票代码格式转换...")
+    for original, expected in FORMAT_CASES:
+        symbol = SYMBOL_MAP[original]
+        status = "✓" if symbol == expected else "✗"
+        print(f"{status} {original} -> {symbol} (期望: {expected})")
+    
+    # 4. 测试实际数据获取
+    print("\n[步骤 4] 测试实际数据获取...")
+    print("-" * 60)
+    
+    start_date, end_date = recent_window()
+    
+    # 各股票的网络请求并发执行，哪只先完成就先输出哪只；
+    # 请求复用长连接，避免每次重新建立TCP/TLS连接 (执行器各线程使用各自的会话)；
+    # 两者均只在本步骤内生效，结束后恢复 requests 的原有行为
+    with shared_http_session(), fast_json() as orjson_enabled:
+        if orjson_enabled:
+            print("✓ 使用 orjson 解析行情数据")
+        async for (ticker, name), (symbol, result) in iter_fetches(stock_zh_a_hist, TEST_STOCKS, start_date, end_date, stock_info):
+            print(f"\n测试股票: {ticker} ({name})")
+            print("-" * 40)
+            print(f"  转换后的代码: {symbol}")
+            
+            if isinstance(result, Exception):
+                print(f"  ✗ 获取失败: {type(result).__name__}: {str(result)}")
+                continue
+            
+            df = result
+            if df is None or df.empty:
+                print(f"  ✗ 返回空数据")
+            else:
+                print(f"  ✓ 成功获取 {len(df)} 条记录")
+                # akshare 按日期升序返回，首尾两行即为日期范围，无需整列扫描
+                dates = df['日期']
+                print(f"  列名: {list(df.columns)}")
+                print(f"  日期范围: {dates.iloc[0]} 至 {dates.iloc[-1]}")
+                print(f"  数据示例 (前3行):")
+                print(df[HIST_COLUMNS].head(3))
+    
+    # 5. 给出诊断结果和建议
+    print("\n" + "=" * 60)
+    print("诊断完成")
+    print("=" * 60)
+    
+    print("\n可能的问题和解决方案:")
+    print("1. 如果网络连接异常:")
+    print("   - 检查网络连接")
+    print("   - 检查防火墙设置")
+    print("   - 考虑使用代理")
+    
+    print("\n2. 如果 akshare 版本过旧:")
+    print("   - 运行: pip install akshare --upgrade")
+    
+    print("\n3. 如果股票代码错误:")
+    print("   - 上海股票使用 .SH 后缀 (如 600941.SH)")
+    print("   - 深圳股票使用 .SZ 后缀 (如 000001.SZ)")
+    
+    print("\n4. 如果数据返回空:")
+    print("   - 检查股票代码是否正确")
+    print("   - 检查日期范围是否合理")
+    print("   - 该股票可能在指定日期范围内停牌")
+    
+    print("\n5. 如果提示'没有成功获取任何股票数据':")
+    print("   - 股票代码可能不存在")
+    print("   - 尝试使用其他常见股票代码测试")
+    print("   - 检查 akshare 接口是否有变化")
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
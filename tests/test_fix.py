@@ -1,20 +1,20 @@
 """
 测试修复后的数据获取功能
 验证能否正确处理带名称的股票代码
+
+既可直接运行输出测试报告，也可由 pytest 收集执行:
+    python tests/test_fix.py
+    pytest tests/test_fix.py
 """
 
 import sys
+import tempfile
 sys.path.append('.')
 
-from core.data_handler import DataHandler
-from core.config import DATA_CONFIG
-
-print("=" * 60)
-print("测试修复后的数据获取功能")
-print("=" * 60)
+import pytest
 
 # 测试用例：包含和不包含股票名称的代码
-test_cases = [
+TEST_CASES = [
     {
         "name": "测试1: 纯股票代码",
         "ticker": "000001.SZ",
@@ -32,54 +32,133 @@ test_cases = [
     }
 ]
 
-# 配置数据处理器
-config = DATA_CONFIG.copy()
-config['start_date'] = '2024-01-01'
-config['end_date'] = '2024-10-01'
-config['use_cache'] = False  # 不使用缓存，确保真实获取数据
-
-print("\n数据源配置:")
-print(f"  数据源: {config['data_source']}")
-print(f"  日期范围: {config['start_date']} 至 {config['end_date']}")
-print(f"  缓存: {'启用' if config['use_cache'] else '禁用'}")
-
-# 执行测试
-for i, test_case in enumerate(test_cases, 1):
-    print(f"\n{'=' * 60}")
-    print(f"{test_case['name']}")
-    print(f"说明: {test_case['description']}")
-    print(f"输入代码: {test_case['ticker']}")
-    print('-' * 60)
+
+def clean_ticker(ticker):
+    """与数据层相同的代码清理规则"""
+    return ticker.split(' - ')[0].split('(')[0].strip()
+
+
+def unique_tickers(test_cases):
+    """
+    去掉完全相同的原始代码字符串，保持首次出现的顺序
     
-    try:
-        # 创建数据处理器
-        handler = DataHandler(config)
-        
-        # 获取数据
-        data = handler.get_data([test_case['ticker']])
+    只合并逐字相同的输入；指向同一代码的不同写法正是本测试要验证的对象，
+    必须各自交给数据层解析
+    """
+    return list(dict.fromkeys(test_case['ticker'] for test_case in test_cases))
+
+
+# ---------------------------------------------------------------------------
+# pytest 用例
+# ---------------------------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def fetch_case(handler, network):
+    """
+    按原始代码逐个请求数据，会话内完全相同的代码只请求一次
+    
+    每种写法单独请求：某种写法解析失败时只有对应用例失败，
+    不会被其他写法取回的同代码数据掩盖
+    """
+    results = {}
+    
+    def fetch(ticker):
+        if ticker not in results:
+            results[ticker] = handler.get_data([ticker])
+        return results[ticker]
+    
+    return fetch
+
+
+@pytest.mark.parametrize('test_case', TEST_CASES, ids=[c['ticker'] for c in TEST_CASES])
+def test_ticker_with_name(fetch_case, test_case):
+    data = fetch_case(test_case['ticker'])
+    
+    assert not data.empty, f"{test_case['name']}: 返回空数据"
+    assert (data['Ticker'] == clean_ticker(test_case['ticker'])).all()
+    assert data.columns.tolist() == ['Open', 'High', 'Low', 'Close', 'Volume', 'Ticker']
+
+
+# ---------------------------------------------------------------------------
+# 脚本模式: 输出完整测试报告
+# ---------------------------------------------------------------------------
+
+def main():
+    from data.data_handler import DataHandler
+    from tests.helpers import build_config
+    from utils.http_session import shared_http_session
+    
+    print("=" * 60)
+    print("测试修复后的数据获取功能")
+    print("=" * 60)
+    
+    # 缓存写入临时目录，数据取回后即删除
+    cache_dir = tempfile.TemporaryDirectory()
+    config = build_config(cache_dir.name)
+    
+    print("\n数据源配置:")
+    print(f"  数据源: {config['data_source']}")
+    print(f"  日期范围: {config['start_date']} 至 {config['end_date']}")
+    print(f"  缓存: {'启用' if config['use_cache'] else '禁用'} ({config['cache_dir']})")
+    
+    # 共用一个数据处理器；每种写法单独请求 (仅去掉完全相同的代码)，
+    # 某种写法解析失败时只影响对应用例
+    handler = DataHandler(config)
+    results = {}
+    # 数据层经 akshare 发出的请求复用长连接
+    with shared_http_session():
+        for ticker in unique_tickers(TEST_CASES):
+            try:
+                results[ticker] = handler.get_data([ticker])
+            except Exception as e:
+                results[ticker] = e
+    cache_dir.cleanup()
+    
+    # 执行测试 (每个用例的输出先拼接好，再一次性写出)
+    for i, test_case in enumerate(TEST_CASES, 1):
+        lines = [
+            f"\n{'=' * 60}",
+            f"{test_case['name']}",
+            f"说明: {test_case['description']}",
+            f"输入代码: {test_case['ticker']}",
+            '-' * 60,
+        ]
         
-        if data is not None and not data.empty:
-            print(f"✓ 测试通过")
-            print(f"  获取到 {len(data)} 条记录")
-            print(f"  日期范围: {data.index.min()} 至 {data.index.max()}")
-            print(f"  股票代码: {data['Ticker'].unique()[0]}")
-            print(f"  数据列: {data.columns.tolist()}")
-            print(f"\n  数据示例 (前3行):")
-            print(data.head(3))
+        result = results[test_case['ticker']]
+        if isinstance(result, Exception):
+            lines.append(f"✗ 测试失败: {type(result).__name__}: {str(result)}")
         else:
-            print(f"✗ 测试失败: 返回空数据")
+            data = result
             
-    except Exception as e:
-        print(f"✗ 测试失败: {type(e).__name__}: {str(e)}")
-
-print("\n" + "=" * 60)
-print("测试完成")
-print("=" * 60)
-
-print("\n总结:")
-print("如果所有测试都通过，说明修复成功。")
-print("现在GUI中可以正确处理带名称的股票代码了。")
-print("\n推荐操作:")
-print("1. 在GUI中尝试从下拉列表选择股票（如 '000001.SZ - 平安银行'）")
-print("2. 点击'开始回测'")
-print("3. 应该能正常获取数据并完成回测")
+            if data.empty:
+                lines.append(f"✗ 测试失败: 返回空数据")
+            elif not (data['Ticker'] == clean_ticker(test_case['ticker'])).all():
+                lines.append(f"✗ 测试失败: 代码解析错误 {data['Ticker'].unique().tolist()}")
+            else:
+                lines += [
+                    f"✓ 测试通过",
+                    f"  获取到 {len(data)} 条记录",
+                    f"  日期范围: {data.index.min()} 至 {data.index.max()}",
+                    f"  股票代码: {data['Ticker'].unique()[0]}",
+                    f"  数据列: {data.columns.tolist()}",
+                    f"\n  数据示例 (前3行):",
+                    str(data.head(3)),
+                ]
+        
+        sys.stdout.write('\n'.join(lines) + '\n')
+    
+    print("\n" + "=" * 60)
+    print("测试完成")
+    print("=" * 60)
+    
+    print("\n总结:")
+    print("如果所有测试都通过，说明修复成功。")
+    print("现在GUI中可以正确处理带名称的股票代码了。")
+    print("\n推荐操作:")
+    print("1. 在GUI中尝试从下拉列表选择股票（如 '000001.SZ - 平安银行'）")
+    print("2. 点击'开始回测'")
+    print("3. 应该能正常获取数据并完成回测")
+
+
+if __name__ == '__main__':
+    main()
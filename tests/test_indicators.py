@@ -0,0 +1,181 @@
+"""
+指标计算内核测试
+numba 已安装时同时验证编译版本和原始Python版本 (py_func)，两者结果必须一致
+"""
+
+import importlib.util
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies import indicators
+from strategies.indicators import (
+    KDJ_EXIT_NONE, KDJ_EXIT_OVERBOUGHT, KDJ_EXIT_STOP_LOSS,
+    KDJ_EXIT_TAKE_PROFIT, KDJ_EXIT_TRAILING_STOP,
+    kdj_signals, long_only_signals,
+)
+from tests.helpers import random_walk
+
+
+def _load_without_numba():
+    """在屏蔽 numba 的情况下重新执行指标模块，得到走占位装饰器的纯Python版本"""
+    spec = importlib.util.find_spec('strategies.indicators')
+    module = importlib.util.module_from_spec(spec)
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setitem(sys.modules, 'numba', None)
+        spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope='module', params=['default', 'no_numba'])
+def impl(request):
+    """指标模块的两种实现: 当前环境下的默认版本，以及未安装 numba 时的退化版本"""
+    if request.param == 'default':
+        return indicators
+    module = _load_without_numba()
+    assert not hasattr(module.ewma, 'py_func')
+    return module
+
+
+def _variants(kernel):
+    """内核的可调用版本: 编译版本，以及 numba 可用时的原始Python函数"""
+    variants = [kernel]
+    if hasattr(kernel, 'py_func'):
+        variants.append(kernel.py_func)
+    return variants
+
+
+# ---------------------------------------------------------------------------
+# 单向持仓状态机
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('kernel', _variants(long_only_signals))
+def test_long_only_signals_transitions(kernel):
+    entry = np.array([0, 1, 1, 0, 0, 0, 1, 1, 1], dtype=bool)
+    exit_ = np.array([1, 0, 0, 1, 1, 0, 1, 1, 0], dtype=bool)
+    
+    signal = kernel(entry, exit_)
+    
+    # 第0天: 空仓时的卖出条件被忽略
+    # 第2天: 持仓时再次出现的买入条件被忽略
+    # 第4天: 已卖出，重复的卖出条件被忽略
+    # 第6天: 空仓时买卖条件同时出现 => 买入
+    # 第7天: 持仓时买卖条件同时出现 => 卖出，当天不再买入
+    expected = np.array([0, 1, 0, -1, 0, 0, 1, -1, 1], dtype=np.int8)
+    np.testing.assert_array_equal(signal, expected)
+    assert signal.dtype == np.int8
+
+
+@pytest.mark.parametrize('kernel', _variants(long_only_signals))
+def test_long_only_signals_empty_input(kernel):
+    signal = kernel(np.zeros(0, dtype=bool), np.zeros(0, dtype=bool))
+    assert signal.shape == (0,) and signal.dtype == np.int8
+
+
+# ---------------------------------------------------------------------------
+# KDJ 状态机
+# ---------------------------------------------------------------------------
+
+# 默认风控参数: 超卖20/超买80，止损10%，止盈20%，盈利10%后回撤8%移动止损
+KDJ_PARAMS = (20.0, 80.0, 0.10, 0.20, 0.08, 0.10)
+
+# 每行: (收盘价, K, D, 期望信号, 期望卖出原因)
+KDJ_CASES = [
+    # 固定止损: 亏损 5% 继续持有，亏损 11% 卖出
+    (100.0, 10.0, 5.0, 1, KDJ_EXIT_NONE),
+    (95.0, 15.0, 20.0, 0, KDJ_EXIT_NONE),
+    (89.0, 50.0, 50.0, -1, KDJ_EXIT_STOP_LOSS),
+    # 固定止盈: 盈利 21%
+    (100.0, 10.0, 5.0, 1, KDJ_EXIT_NONE),
+    (121.0, 50.0, 50.0, -1, KDJ_EXIT_TAKE_PROFIT),
+    # 移动止损: 最高盈利 19.9% (未达止盈)，回撤 8.1% 且仍盈利 10.2%
+    (100.0, 10.0, 5.0, 1, KDJ_EXIT_NONE),
+    (119.9, 50.0, 50.0, 0, KDJ_EXIT_NONE),
+    (110.2, 50.0, 50.0, -1, KDJ_EXIT_TRAILING_STOP),
+    # KDJ超买: K > 80 且 K < D
+    (100.0, 10.0, 5.0, 1, KDJ_EXIT_NONE),
+    (101.0, 85.0, 90.0, -1, KDJ_EXIT_OVERBOUGHT),
+    # 空仓时超卖但 K < D: 不买入
+    (100.0, 10.0, 15.0, 0, KDJ_EXIT_NONE),
+    # 止损优先于超买
+    (100.0, 10.0, 5.0, 1, KDJ_EXIT_NONE),
+    (85.0, 85.0, 90.0, -1, KDJ_EXIT_STOP_LOSS),
+    # 持仓时再次出现买入条件被忽略
+    (100.0, 10.0, 5.0, 1, KDJ_EXIT_NONE),
+    (101.0, 10.0, 5.0, 0, KDJ_EXIT_NONE),
+]
+
+
+@pytest.mark.parametrize('kernel', _variants(kdj_signals))
+def test_kdj_signals_entries_and_exit_reasons(kernel):
+    close, k, d, expected_signal, expected_reason = (np.array(col) for col in zip(*KDJ_CASES))
+    
+    signal, exit_reason = kernel(close, k, d, *KDJ_PARAMS)
+    
+    np.testing.assert_array_equal(signal, expected_signal)
+    np.testing.assert_array_equal(exit_reason, expected_reason)
+    assert signal.dtype == np.int8 and exit_reason.dtype == np.int8
+
+
+# ---------------------------------------------------------------------------
+# 指数加权移动平均 / MACD 与 pandas 的一致性
+# ---------------------------------------------------------------------------
+
+def _with_leading_nan(x, count=5):
+    x = x.copy()
+    x[:count] = np.nan
+    return x
+
+
+EWMA_INPUTS = {
+    'random_walk': random_walk(300, seed=1),
+    'leading_nan': _with_leading_nan(random_walk(300, seed=2)),
+    'all_nan_prefix_then_one': np.r_[np.full(4, np.nan), 42.0],
+    'constant': np.full(50, 37.5),
+    'single': np.array([3.0]),
+    'empty': np.zeros(0),
+}
+
+
+@pytest.mark.parametrize('span', [3, 9, 12, 26])
+@pytest.mark.parametrize('name', list(EWMA_INPUTS))
+def test_ewma_matches_pandas(impl, name, span):
+    x = EWMA_INPUTS[name]
+    
+    result = impl.ewma(x, 2.0 / (span + 1))
+    expected = pd.Series(x).ewm(span=span, adjust=False).mean().to_numpy()
+    
+    np.testing.assert_allclose(result, expected, rtol=1e-13, atol=0, equal_nan=True)
+
+
+@pytest.mark.parametrize('fast,slow,signal', [(12, 26, 9), (5, 35, 5), (3, 10, 16)])
+@pytest.mark.parametrize('seed', range(3))
+def test_macd_kernel_matches_pandas(impl, seed, fast, slow, signal):
+    close = random_walk(300, seed)
+    
+    macd, signal_line, hist, cross_up, cross_down = impl.macd_kernel(close, fast, slow, signal)
+    
+    series = pd.Series(close)
+    expected_macd = (series.ewm(span=fast, adjust=False).mean()
+                     - series.ewm(span=slow, adjust=False).mean())
+    expected_signal = expected_macd.ewm(span=signal, adjust=False).mean()
+    expected_hist = expected_macd - expected_signal
+    
+    np.testing.assert_allclose(macd, expected_macd, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(signal_line, expected_signal, rtol=1e-10, atol=1e-12)
+    np.testing.assert_allclose(hist, expected_hist, rtol=1e-10, atol=1e-12)
+    
+    # 交叉: 柱状图由非正转正 / 由非负转负，首日恒为 False
+    h = expected_hist.to_numpy()
+    expected_up = np.r_[False, (h[1:] > 0) & (h[:-1] <= 0)]
+    expected_down = np.r_[False, (h[1:] < 0) & (h[:-1] >= 0)]
+    np.testing.assert_array_equal(cross_up, expected_up)
+    np.testing.assert_array_equal(cross_down, expected_down)
+    assert cross_up.any() and cross_down.any()
+
+
+def test_macd_kernel_empty_input(impl):
+    outputs = impl.macd_kernel(np.zeros(0), 12, 26, 9)
+    assert all(len(out) == 0 for out in outputs)
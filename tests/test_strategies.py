@@ -0,0 +1,199 @@
+"""
+策略层测试
+不依赖网络，直接用构造的OHLCV数据验证信号生成
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategies.base_strategy import StrategyFactory, _strategy_registry, clear_signal_cache
+from strategies.long_term_strategies import MeanReversionStrategy
+from strategies.short_term_strategies import DualMovingAverageStrategy, KDJStrategy, RSIStrategy
+from tests.helpers import make_ohlcv, random_walk
+
+
+@pytest.fixture(autouse=True)
+def empty_signal_cache():
+    """每个用例前后清空信号缓存，避免用例之间互相命中"""
+    clear_signal_cache()
+    yield
+    clear_signal_cache()
+
+
+# ---------------------------------------------------------------------------
+# 信号缓存
+# ---------------------------------------------------------------------------
+
+def _dual_ma():
+    return DualMovingAverageStrategy({'short_window': 5, 'long_window': 10})
+
+
+def test_signal_cache_hit_returns_equal_copy():
+    data = make_ohlcv(random_walk(60)).assign(Ticker='000001.SZ')
+    strategy = _dual_ma()
+    
+    first = strategy.generate_signals(data)
+    second = strategy.generate_signals(data)
+    
+    pd.testing.assert_frame_equal(first, second)
+    assert first is not second
+
+
+def test_signal_cache_misses_on_changed_interior_index():
+    data = make_ohlcv(random_walk(60))
+    strategy = _dual_ma()
+    strategy.generate_signals(data)
+    
+    # 只改动中间的一个日期，首尾日期和价格都不变
+    index = data.index.to_list()
+    index[30] = index[30] + pd.Timedelta(hours=1)
+    shifted = data.set_axis(pd.DatetimeIndex(index))
+    
+    result = strategy.generate_signals(shifted)
+    assert result.index.equals(shifted.index[strategy.long_window - 1:])
+
+
+def test_signal_cache_misses_on_changed_passthrough_column():
+    data = make_ohlcv(random_walk(60)).assign(Ticker='000001.SZ')
+    strategy = _dual_ma()
+    strategy.generate_signals(data)
+    
+    result = strategy.generate_signals(data.assign(Ticker='600000.SH'))
+    assert (result['Ticker'] == '600000.SH').all()
+
+
+# ---------------------------------------------------------------------------
+# 均值回归
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('seed', [12, 16])
+@pytest.mark.parametrize('use_float32', [False, True])
+def test_mean_reversion_flat_stretch_after_history_has_no_signal(seed, use_float32):
+    # 波动历史之后接一段平盘：滑动标准差只剩舍入残差，不应产生任何信号
+    flat_len = 40
+    close = np.r_[random_walk(80, seed), np.full(flat_len, 101.37)]
+    strategy = MeanReversionStrategy({'use_float32': use_float32})
+    
+    result = strategy.generate_signals(make_ohlcv(close))
+    
+    fully_flat = result.iloc[-(flat_len - strategy.lookback_period + 1):]
+    assert fully_flat['Deviation'].isna().all()
+    assert (fully_flat['signal'] == 0).all()
+    assert np.isfinite(result['Deviation'].dropna()).all()
+
+
+# ---------------------------------------------------------------------------
+# KDJ
+# ---------------------------------------------------------------------------
+
+def _ohlc_with_range(close, seed=0):
+    """在收盘价上下加入随机波幅，得到有意义的最高/最低价"""
+    rng = np.random.default_rng(seed)
+    data = make_ohlcv(close)
+    spread = np.abs(rng.normal(0, 0.8, len(close)))
+    return data.assign(High=data['Close'] + spread, Low=data['Close'] - spread)
+
+
+def _reference_kdj(data, strategy):
+    """原 pandas 实现: rolling/ewm 计算KDJ，再逐行执行状态机"""
+    low = data['Low'].rolling(strategy.kdj_n, min_periods=strategy.kdj_n).min()
+    high = data['High'].rolling(strategy.kdj_n, min_periods=strategy.kdj_n).max()
+    rsv = ((data['Close'] - low) / (high - low).replace(0, np.nan) * 100).fillna(50)
+    k = rsv.ewm(span=strategy.kdj_m1, adjust=False).mean()
+    d = k.ewm(span=strategy.kdj_m2, adjust=False).mean()
+    
+    signal = np.zeros(len(data), dtype=int)
+    holding, entry_price, highest_price = False, 0.0, 0.0
+    for i, price in enumerate(data['Close']):
+        if not holding:
+            if k.iloc[i] < strategy.oversold and k.iloc[i] > d.iloc[i]:
+                signal[i], holding = 1, True
+                entry_price = highest_price = price
+            continue
+        highest_price = max(highest_price, price)
+        profit_rate = (price - entry_price) / entry_price
+        drawdown = (price - highest_price) / highest_price
+        if (profit_rate <= -strategy.stop_loss
+                or profit_rate >= strategy.take_profit
+                or (profit_rate >= strategy.trailing_trigger and drawdown <= -strategy.trailing_stop)
+                or (k.iloc[i] > strategy.overbought and k.iloc[i] < d.iloc[i])):
+            signal[i], holding = -1, False
+    return k, d, signal
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_kdj_matches_reference_implementation(seed):
+    data = _ohlc_with_range(random_walk(400, seed), seed)
+    strategy = KDJStrategy({})
+    
+    result = strategy.generate_signals(data)
+    k, d, signal = _reference_kdj(data, strategy)
+    
+    np.testing.assert_allclose(result['K'], k, rtol=1e-12)
+    np.testing.assert_allclose(result['D'], d, rtol=1e-12)
+    np.testing.assert_array_equal(result['signal'], signal)
+    assert (signal != 0).sum() > 0
+
+
+# ---------------------------------------------------------------------------
+# 多股票批量信号
+# ---------------------------------------------------------------------------
+
+# (代码, 行数): 最后一只的数据量不足一个长均线窗口，逐只调用时返回空表
+BATCH_TICKERS = [('000001.SZ', 120), ('600000.SH', 90), ('600941.SH', 60), ('300750.SZ', 8)]
+
+
+def _long_table(interleave):
+    """多只股票的长表数据；interleave 为 True 时按日期交错排列各股票的行"""
+    frames = [
+        make_ohlcv(random_walk(rows, seed), start='2021-01-01').assign(symbol=ticker)
+        for seed, (ticker, rows) in enumerate(BATCH_TICKERS)
+    ]
+    data = pd.concat(frames)
+    if interleave:
+        data = data.rename_axis('Date').sort_values(['Date', 'symbol'], kind='stable')
+    return data
+
+
+@pytest.mark.parametrize('interleave', [False, True])
+@pytest.mark.parametrize('strategy_cls,config', [
+    # 双均线覆盖了 groupby().transform() 的向量化实现，RSI 使用基类的逐组实现
+    (DualMovingAverageStrategy, {'short_window': 5, 'long_window': 20}),
+    (RSIStrategy, {'rsi_period': 14}),
+])
+def test_generate_signals_batch_matches_per_ticker(strategy_cls, config, interleave):
+    data = _long_table(interleave)
+    strategy = strategy_cls(config)
+    
+    batch = strategy_cls.generate_signals_batch(data, config)
+    
+    per_ticker = [strategy.generate_signals(group) for _, group in data.groupby('symbol', sort=False)]
+    assert sum(df.empty for df in per_ticker) == 1
+    expected = pd.concat([df for df in per_ticker if not df.empty])
+    
+    def ordered(df):
+        return df.rename_axis('Date').sort_values(['symbol', 'Date'], kind='stable')
+    
+    assert set(batch['symbol']) == {ticker for ticker, _ in BATCH_TICKERS[:-1]}
+    pd.testing.assert_frame_equal(ordered(batch), ordered(expected))
+
+
+# ---------------------------------------------------------------------------
+# 输出控制
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize('verbose', [False, True])
+@pytest.mark.parametrize('name', sorted(_strategy_registry()))
+def test_verbose_controls_all_strategy_output(name, verbose, capsys, caplog):
+    caplog.set_level(logging.INFO)
+    config = {'strategy_name': name, 'short_window': 5, 'long_window': 20, 'verbose': verbose}
+    
+    strategy = StrategyFactory.create_strategy(config)
+    strategy.generate_signals(make_ohlcv(random_walk(5)))      # 数据量不足
+    strategy.generate_signals(make_ohlcv(random_walk(200)))
+    
+    emitted = capsys.readouterr().out.strip() or caplog.records
+    assert bool(emitted) == verbose
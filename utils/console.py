@@ -0,0 +1,29 @@
+"""
+控制台编码工具 - 解决Windows控制台中文乱码问题
+"""
+
+import sys
+
+
+def ensure_utf8():
+    """
+    将Windows控制台和Python标准输出切换为UTF-8编码
+
+    直接调用Win32 API设置控制台代码页（等价于 chcp 65001），
+    无需启动子进程；非Windows平台不做任何处理
+    """
+    if sys.platform != 'win32':
+        return
+
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetConsoleOutputCP(65001)
+        kernel32.SetConsoleCP(65001)
+
+        # 设置Python默认编码
+        if hasattr(sys.stdout, 'reconfigure'):
+            sys.stdout.reconfigure(encoding='utf-8')
+            sys.stderr.reconfigure(encoding='utf-8')
+    except Exception as e:
+        print(f"Warning: Failed to set UTF-8 encoding: {e}")
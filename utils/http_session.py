@@ -0,0 +1,63 @@
+"""
+HTTP会话复用工具 - 让 akshare 等库的请求复用长连接
+"""
+
+import threading
+from contextlib import contextmanager
+
+
+@contextmanager
+def shared_http_session():
+    """
+    在 with 块内让 requests.get/post 等模块级调用复用会话中的长连接
+
+    akshare 的行情接口每次调用都直接使用 requests.get，默认每次新建会话，
+    对同一服务器的连续请求都要重新建立TCP和TLS连接。
+    akshare 没有可注入会话的入口，这里临时替换 requests 的模块级 request 函数，
+    退出 with 块时恢复原函数并关闭会话。
+    requests.Session 不保证线程安全，因此每个线程使用各自的会话。
+    适配器不做连接级重试，失败重试统一由调用方 (如 fetch_with_retry) 负责，
+    避免两层重试叠加放大等待时间
+
+    Yields:
+        bool: 是否已启用会话复用 (未安装 requests 时为 False，不做任何处理)
+    """
+    try:
+        import requests
+        import requests.api
+        from requests.adapters import HTTPAdapter
+    except ImportError:
+        yield False
+        return
+
+    local = threading.local()
+    sessions = []
+    lock = threading.Lock()
+
+    def get_session():
+        session = getattr(local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter()
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            local.session = session
+            with lock:
+                sessions.append(session)
+        return session
+
+    def request(method, url, **kwargs):
+        return get_session().request(method=method, url=url, **kwargs)
+
+    # requests.get 等函数在 requests.api 模块内查找 request
+    original_api_request = requests.api.request
+    original_request = requests.request
+    requests.api.request = request
+    requests.request = request
+    try:
+        yield True
+    finally:
+        requests.api.request = original_api_request
+        requests.request = original_request
+        for session in sessions:
+            session.close()